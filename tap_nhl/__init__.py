@@ -0,0 +1 @@
+"""Singer tap for the NHL stats API."""
@@ -0,0 +1,114 @@
+"""Append-only, compressed archive of raw per-game API responses."""
+
+import mmap
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# index entry: game ID, response kind, data offset, compressed length, CRC32
+INDEX_ENTRY = struct.Struct("<qBQII")
+# response kinds, keyed like the planner's per-game endpoints
+ARCHIVE_KINDS = {"game_feed": 1, "shiftcharts": 2}
+COMPRESSION_LEVEL = 6
+
+
+def archive_kind(url: str) -> Optional[str]:
+    """Return the archive kind of a per-game request URL, or None."""
+    if "/feed/live" in url:
+        return "game_feed"
+    if "/shiftcharts" in url:
+        return "shiftcharts"
+    return None
+
+
+class GameArchive:
+    """Raw response bodies appended to a data file with a fixed-width index.
+
+    Bodies are zlib-compressed and appended to `responses.dat`; every append
+    adds an index entry to `responses.idx`. The index is small enough to load
+    whole, the data file is read through a memory map. A game archived twice
+    keeps both bodies and the latest one wins. Only one process may append;
+    appends and reads from several threads of that process are serialized.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Open or create the archive files in the directory `path`."""
+        path.mkdir(parents=True, exist_ok=True)
+        self._data_path = path / "responses.dat"
+        self._index_path = path / "responses.idx"
+        self._data_path.touch()
+        self._index_path.touch()
+        self._entries: Dict[Tuple[int, int], Tuple[int, int, int]] = {}
+        self._data_size = self._data_path.stat().st_size
+        self._load_index()
+        self._map: Optional[mmap.mmap] = None
+        self._mapped_size = 0
+        self._lock = threading.Lock()
+
+    def _load_index(self) -> None:
+        index = self._index_path.read_bytes()
+        # a torn trailing entry or one pointing past the data is left from a crash
+        usable = len(index) - len(index) % INDEX_ENTRY.size
+        for entry in INDEX_ENTRY.iter_unpack(index[:usable]):
+            game_id, kind, offset, length, crc = entry
+            if offset + length <= self._data_size:
+                self._entries[(game_id, kind)] = (offset, length, crc)
+
+    def _view(self) -> mmap.mmap:
+        if self._map is None or self._mapped_size != self._data_size:
+            if self._map is not None:
+                self._map.close()
+            with open(self._data_path, "rb") as data_file:
+                self._map = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped_size = self._data_size
+        return self._map
+
+    def __contains__(self, key: Tuple[int, str]) -> bool:
+        game_id, kind = key
+        return (int(game_id), ARCHIVE_KINDS[kind]) in self._entries
+
+    def game_ids(self, kinds: Iterable[str] = ARCHIVE_KINDS) -> List[int]:
+        """Return the archived game IDs having a body of every kind in `kinds`."""
+        codes = {ARCHIVE_KINDS[kind] for kind in kinds}
+        games: Dict[int, set] = {}
+        for game_id, code in self._entries:
+            games.setdefault(game_id, set()).add(code)
+        return sorted(game_id for game_id, found in games.items() if codes <= found)
+
+    def get(self, game_id: int, kind: str) -> Optional[bytes]:
+        """Return the latest archived body of a game response, or None."""
+        entry = self._entries.get((int(game_id), ARCHIVE_KINDS[kind]))
+        if entry is None:
+            return None
+        offset, length, crc = entry
+        with self._lock:
+            compressed = self._view()[offset : offset + length]
+        if zlib.crc32(compressed) != crc:
+            raise ValueError(f"Corrupt archive entry for game {game_id} ({kind})")
+        return zlib.decompress(compressed)
+
+    def put(self, game_id: int, kind: str, body: bytes) -> None:
+        """Append a response body unless it matches the latest archived one."""
+        key = (int(game_id), ARCHIVE_KINDS[kind])
+        compressed = zlib.compress(body, COMPRESSION_LEVEL)
+        crc = zlib.crc32(compressed)
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None and previous[1:] == (len(compressed), crc):
+                return
+            offset = self._data_size
+            entry = INDEX_ENTRY.pack(*key, offset, len(compressed), crc)
+            with open(self._data_path, "ab") as data_file:
+                data_file.write(compressed)
+            with open(self._index_path, "ab") as index_file:
+                index_file.write(entry)
+            self._data_size = offset + len(compressed)
+            self._entries[key] = (offset, len(compressed), crc)
+
+    def close(self) -> None:
+        """Release the memory map of the data file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
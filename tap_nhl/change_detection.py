@@ -0,0 +1,117 @@
+"""Primary key to content hash index used to skip unchanged records across runs."""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+
+DIGEST_SIZE = 8
+
+# (partition, key) pairs identifying an indexed record within its stream
+IndexKey = Tuple[str, str]
+
+
+def record_digest(record: dict) -> bytes:
+    """Return a compact, key-order independent hash of a record."""
+    payload = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+
+
+def record_key(record: dict, primary_keys: List[str]) -> str:
+    """Return the index key of a record from its primary key values."""
+    return json.dumps([record.get(key) for key in primary_keys], default=str)
+
+
+class RecordHashIndex:
+    """SQLite-backed index of the last emitted content hash per record.
+
+    Hashes are kept per stream and partition (the season a record was synced
+    for), so the same primary key synced for several seasons is tracked once
+    per season. Each stream's hashes are loaded into memory on first use.
+    Hashes seen in the current run are written back by `save`, so an
+    interrupted run re-emits its records the next time instead of losing them.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Open or create the SQLite hash index at `path`."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(path))
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS partitioned_record_hashes "
+            "(stream TEXT NOT NULL, partition TEXT NOT NULL, key TEXT NOT NULL, "
+            "hash BLOB NOT NULL, PRIMARY KEY (stream, partition, key)) WITHOUT ROWID"
+        )
+        self._connection.commit()
+        self._known: Dict[str, Dict[IndexKey, bytes]] = {}
+        self._seen: Dict[str, Dict[IndexKey, bytes]] = {}
+
+    def _load(self, stream_name: str) -> Dict[IndexKey, bytes]:
+        if stream_name not in self._known:
+            rows = self._connection.execute(
+                "SELECT partition, key, hash FROM partitioned_record_hashes "
+                "WHERE stream = ?",
+                (stream_name,),
+            )
+            self._known[stream_name] = {
+                (partition, key): bytes(digest) for partition, key, digest in rows
+            }
+            self._seen[stream_name] = {}
+        return self._known[stream_name]
+
+    def is_changed(
+        self, stream_name: str, key: str, record: dict, partition: str = ""
+    ) -> bool:
+        """Record `record` as seen and return True if it differs from last run."""
+        known = self._load(stream_name)
+        digest = record_digest(record)
+        seen = self._seen[stream_name]
+        index_key = (partition, key)
+        if index_key in seen:
+            # the same key emitted twice in one run (e.g. people on two rosters)
+            changed = seen[index_key] != digest
+        else:
+            changed = known.get(index_key) != digest
+        seen[index_key] = digest
+        return changed
+
+    def seen_streams(self) -> Iterable[str]:
+        """Return the streams that produced at least one record in this run."""
+        return [name for name, seen in self._seen.items() if seen]
+
+    def missing_keys(self, stream_name: str) -> Set[IndexKey]:
+        """Return keys indexed by an earlier run but not seen in this one.
+
+        Only partitions with at least one record in this run are compared, so
+        seasons outside the synced range never look deleted.
+        """
+        known = self._load(stream_name)
+        seen = self._seen[stream_name]
+        partitions = {partition for partition, _ in seen}
+        return {
+            index_key
+            for index_key in known
+            if index_key[0] in partitions and index_key not in seen
+        }
+
+    def save(self, stream_name: str, remove_missing: bool = False) -> None:
+        """Persist the hashes seen in this run, optionally dropping missing keys."""
+        seen = self._seen.get(stream_name, {})
+        if remove_missing:
+            self._connection.executemany(
+                "DELETE FROM partitioned_record_hashes "
+                "WHERE stream = ? AND partition = ? AND key = ?",
+                [
+                    (stream_name, partition, key)
+                    for partition, key in self.missing_keys(stream_name)
+                ],
+            )
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO partitioned_record_hashes "
+            "(stream, partition, key, hash) VALUES (?, ?, ?, ?)",
+            [
+                (stream_name, partition, key, digest)
+                for (partition, key), digest in seen.items()
+            ],
+        )
+        self._connection.commit()
@@ -1,32 +1,154 @@
 """REST client handling, including nhlStream base class."""
 
-import requests
+import importlib
+import json
+import string
+import time
+from collections import ChainMap, OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, Union, List, Iterable
-
-from memoization import cached
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
 
+import requests
+from singer import RecordMessage
+from singer_sdk.exceptions import RetriableAPIError
+from singer_sdk.helpers._catalog import pop_deselected_record_properties
+from singer_sdk.helpers._typing import conform_record_data_types
+from singer_sdk.helpers._util import utc_now
 from singer_sdk.helpers.jsonpath import extract_jsonpath
 from singer_sdk.streams import RESTStream
 
+from tap_nhl.archive import archive_kind
+from tap_nhl.change_detection import record_key
+from tap_nhl.export import export_partition, season_from_game_id
+from tap_nhl.validation import SampledValidator, compile_validator
 
 SCHEMAS_DIR = Path(__file__).parent / Path("./schemas")
+SHARED_RESPONSES_MAXSIZE = 4
+STATE_MESSAGE_INTERVAL = 10.0  # seconds
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "tap-nhl"
+
+
+def get_cache_dir(config: dict) -> Path:
+    """Return the local directory used for tap-nhl caches."""
+    return Path(config.get("cache_dir") or DEFAULT_CACHE_DIR).expanduser()
+
+
+class UrlTemplate:
+    """A URL template split once into literal text and `{field}` references."""
+
+    def __init__(self, template: str) -> None:
+        """Split `template` into literal text and field references."""
+        self.template = template
+        self.parts: List[Tuple[str, Optional[str]]] = [
+            (literal, field)
+            for literal, field, _, _ in string.Formatter().parse(template)
+        ]
+        self.fields = [field for _, field in self.parts if field]
+
+    def render(self, values: Mapping[str, Any], encode: Callable[[Any], str]) -> str:
+        """Substitute `values` into the template; unknown fields are left as is."""
+        pieces = []
+        for literal, field in self.parts:
+            pieces.append(literal)
+            if field:
+                if field in values:
+                    pieces.append(encode(values[field]))
+                else:
+                    pieces.append("".join(["{", field, "}"]))
+        return "".join(pieces)
+
+
+@lru_cache(maxsize=None)
+def compile_url_template(template: str) -> UrlTemplate:
+    """Return the compiled form of a URL template, parsing each template once."""
+    return UrlTemplate(template)
+
+
+class LazySchema:
+    """Stream `schema` attribute that builds its schema module on first access."""
+
+    def __init__(self, module: str, object_name: str) -> None:
+        """Refer to the `object_name` schema class of `tap_nhl.schemas.<module>`."""
+        self.module = f"tap_nhl.schemas.{module}"
+        self.object_name = object_name
+        self._schema: Optional[dict] = None
+
+    def __get__(self, instance: Any, owner: Any) -> dict:
+        if self._schema is None:
+            schema_module = importlib.import_module(self.module)
+            self._schema = getattr(schema_module, self.object_name).schema
+        return self._schema
 
 
 class nhlStream(RESTStream):
     """nhl stream class."""
 
-    url_base = "https://statsapi.web.nhl.com/api/v1"
+    default_url_base = "https://statsapi.web.nhl.com/api/v1"
+    url_base_setting = "api_url"
 
-    # OR use a dynamic url_base:
-    # @property
-    # def url_base(self) -> str:
-    #     """Return the API URL root, configurable via tap settings."""
-    #     return self.config["api_url"]
+    @property
+    def url_base(self) -> str:
+        """Return the API URL root, configurable via tap settings."""
+        return self.config.get(self.url_base_setting) or self.default_url_base
 
     records_jsonpath = "$[*]"  # Or override `parse_response`.
     next_page_token_jsonpath = "$.next_page"  # Or override `get_next_page_token`.
 
+    # Streams reading the same per-game payloads (live feed, shift chart) set
+    # this so that sibling streams of one game reuse a single response.
+    shared_response = False
+
+    # Seconds a response may be served from the local reference cache, or None
+    # when the endpoint is not cached.
+    reference_ttl: Optional[float] = None
+    # context values copied into every record; with an empty
+    # `state_partitioning_keys` the SDK no longer adds them itself
+    record_context_keys: List[str] = []
+
+    def __init__(self, tap, *args, **kwargs) -> None:
+        """Initialize the stream and compile its record validator if enabled."""
+        super().__init__(tap, *args, **kwargs)
+        self._tap = tap
+        self._export_partition: tuple = ()
+        # set while the record just yielded by `get_records` is unchanged
+        self._suppress_record = False
+        self.track_changes = self.name in (
+            self.config.get("suppress_unchanged_streams") or []
+        )
+        if self.track_changes and self.config.get("emit_tombstones"):
+            properties = dict(self.schema["properties"])
+            properties["_sdc_deleted_at"] = {
+                "type": ["string", "null"],
+                "format": "date-time",
+            }
+            self.schema = {**self.schema, "properties": properties}
+        self._record_validator: Optional[SampledValidator] = None
+        if self.config.get("validate_records"):
+            self._record_validator = SampledValidator(
+                compile_validator(self.schema, get_cache_dir(self.config)),
+                sample_rate=float(self.config.get("validation_sample_rate", 1.0)),
+            )
+
+    def get_url_values(self, context: Optional[dict]) -> Mapping[str, Any]:
+        """Return the values available to the URL template, context first."""
+        return ChainMap(context or {}, self.config)
+
+    def get_url(self, context: Optional[dict]) -> str:
+        """Return the request URL rendered from the compiled URL template."""
+        template = compile_url_template("".join([self.url_base, self.path or ""]))
+        return template.render(self.get_url_values(context), self._url_encode)
+
     @property
     def http_headers(self) -> dict:
         """Return the http headers needed."""
@@ -62,7 +184,8 @@ class nhlStream(RESTStream):
         params: dict = {}
         if next_page_token:
             params["page"] = next_page_token
-        if self.replication_key:
+        # shared per-game responses must have the same URL in every stream
+        if self.replication_key and not self.shared_response:
             params["sort"] = "asc"
             params["order_by"] = self.replication_key
         return params
@@ -82,6 +205,269 @@ class nhlStream(RESTStream):
         # TODO: Parse response body and return a set of records.
         yield from extract_jsonpath(self.records_jsonpath, input=response.json())
 
+    def validate_response(self, response: requests.Response) -> None:
+        """Validate a response, retrying rate limited requests like 5xx errors."""
+        if response.status_code == 429:
+            raise RetriableAPIError(
+                f"429 Client Error: {response.reason} for path: {self.path}"
+            )
+        super().validate_response(response)
+
+    def _request(
+        self, prepared_request: requests.PreparedRequest, context: Optional[dict]
+    ) -> requests.Response:
+        """Send a request, reusing a recent shared response for the same URL."""
+        if not self.shared_response:
+            return self._archived_request(prepared_request, context)
+        shared = self._tap.__dict__.setdefault("_shared_responses", OrderedDict())
+        if prepared_request.url in shared:
+            return shared[prepared_request.url]
+        response = self._archived_request(prepared_request, context)
+        shared[prepared_request.url] = response
+        if len(shared) > SHARED_RESPONSES_MAXSIZE:
+            shared.popitem(last=False)
+        return response
+
+    def _archived_request(
+        self, prepared_request: requests.PreparedRequest, context: Optional[dict]
+    ) -> requests.Response:
+        """Send a request, archiving per-game responses or replaying them offline."""
+        archive = getattr(self._tap, "archive", None)
+        kind = archive_kind(prepared_request.url or "")
+        if archive is None or kind is None or not context or "gameId" not in context:
+            return super()._request(prepared_request, context)
+        if self.config.get("reprocess_from_archive"):
+            body = archive.get(context["gameId"], kind)
+            if body is None:
+                raise RuntimeError(
+                    f"Game {context['gameId']} has no archived {kind} response"
+                )
+            response = requests.Response()
+            response.status_code = 200
+            response.url = prepared_request.url or ""
+            response.request = prepared_request
+            response._content = body
+            return response
+        response = super()._request(prepared_request, context)
+        archive.put(context["gameId"], kind, response.content)
+        return response
+
+    def game_requests(self, context: dict) -> Dict[str, requests.PreparedRequest]:
+        """Return the per-game requests of the stream, keyed by archive kind."""
+        prepared_request = self.prepare_request(context, next_page_token=None)
+        kind = archive_kind(prepared_request.url or "")
+        if kind is None:
+            raise ValueError(f"Stream '{self.name}' has no per-game requests")
+        return {kind: prepared_request}
+
+    def pipeline_options(self) -> dict:
+        """Return the settings pipeline workers need to build this stream's records."""
+        return {}
+
+    def get_reference_ttl(self, context: Optional[dict]) -> Optional[float]:
+        """Return the reference cache TTL for a request made with `context`."""
+        if not self.config.get("cache_reference_data"):
+            return None
+        ttls = self.config.get("reference_cache_ttls") or {}
+        return ttls.get(self.name, self.reference_ttl)
+
+    def get_reference_immutable_after(self, context: Optional[dict]) -> Optional[float]:
+        """Return the timestamp after which a cached response never goes stale."""
+        return None
+
+    def request_body(
+        self, prepared_request: requests.PreparedRequest, context: Optional[dict]
+    ) -> bytes:
+        """Send a request and return its raw body, using the reference cache."""
+        ttl = self.get_reference_ttl(context)
+        cache = getattr(self._tap, "reference_cache", None) if ttl is not None else None
+        body = None
+        if cache:
+            immutable_after = self.get_reference_immutable_after(context)
+            body = cache.get(prepared_request.url, ttl, immutable_after)
+        if body is None:
+            decorated_request = self.request_decorator(self._request)
+            body = decorated_request(prepared_request, context).content
+            if cache:
+                cache.put(prepared_request.url, body)
+        return body
+
+    def request_json(
+        self, prepared_request: requests.PreparedRequest, context: Optional[dict]
+    ) -> Any:
+        """Send a request and decode its JSON body, using the reference cache."""
+        return json.loads(self.request_body(prepared_request, context))
+
+    def request_records(self, context: Optional[dict]) -> Iterable[dict]:
+        """Request records, serving cacheable reference endpoints locally."""
+        if self.get_reference_ttl(context) is None:
+            yield from super().request_records(context)
+            return
+        prepared_request = self.prepare_request(context, next_page_token=None)
+        data = self.request_json(prepared_request, context)
+        yield from extract_jsonpath(self.records_jsonpath, input=data)
+
+    def sync(self, context: Optional[dict] = None) -> None:
+        """Sync the stream, profiled per stream when profiling is enabled."""
+        profiler = getattr(self._tap, "profiler", None)
+        if profiler is None:
+            self._sync_partition(context)
+            return
+        with profiler.profile(self.name):
+            self._sync_partition(context)
+
+    def _sync_partition(self, context: Optional[dict]) -> None:
+        """Sync the stream, flushing its columnar export partition afterwards."""
+        exporter = getattr(self._tap, "exporter", None)
+        if exporter is None:
+            super().sync(context)
+            return
+        parent_partition = self._export_partition
+        self._export_partition = export_partition(context)
+        try:
+            super().sync(context)
+            self._flush_export(exporter)
+        finally:
+            self._export_partition = parent_partition
+
+    def _flush_export(self, exporter: Any) -> None:
+        """Write the buffered records of the current export partition."""
+        for stream_map in self.stream_maps:
+            exporter.flush(stream_map.stream_alias, self._export_partition)
+
+    def _conform_record(self, record: dict) -> dict:
+        """Conform a record to the schema, unless the compiled validator did.
+
+        With every record validated, only records with properties outside the
+        schema go through the SDK conforming, which drops those properties.
+        """
+        validator = self._record_validator
+        if (
+            validator
+            and validator.validates_every_record
+            and record.keys() <= self.schema["properties"].keys()
+        ):
+            return record
+        return conform_record_data_types(
+            stream_name=self.name, row=record, schema=self.schema, logger=self.logger
+        )
+
+    def _generate_record_messages(
+        self, record: dict
+    ) -> Generator[RecordMessage, None, None]:
+        """Return the RECORD messages of a record, one per stream map.
+
+        Unlike the SDK, records validated by the compiled validator are not
+        conformed a second time.
+        """
+        pop_deselected_record_properties(record, self.schema, self.mask, self.logger)
+        record = self._conform_record(record)
+        for stream_map in self.stream_maps:
+            mapped_record = stream_map.transform(record)
+            if mapped_record is not None:
+                yield RecordMessage(
+                    stream=stream_map.stream_alias,
+                    record=mapped_record,
+                    version=None,
+                    time_extracted=utc_now(),
+                )
+
+    def _write_record_message(self, record: dict) -> None:
+        """Write a RECORD message, or buffer the record for columnar export.
+
+        Exported records are conformed and mapped like RECORD messages, and
+        each stream map alias is exported with its transformed schema. The
+        message of a record `get_records` found unchanged is dropped.
+        """
+        if self._suppress_record:
+            self._suppress_record = False
+            return
+        exporter = getattr(self._tap, "exporter", None)
+        if exporter is None:
+            super()._write_record_message(record)
+            return
+        record = self._conform_record(record)
+        for stream_map in self.stream_maps:
+            mapped_record = stream_map.transform(record)
+            if mapped_record is not None:
+                exporter.add(
+                    stream_map.stream_alias,
+                    stream_map.transformed_schema,
+                    self._export_partition,
+                    mapped_record,
+                )
+
+    def _write_state_message(self, force: bool = False) -> None:
+        """Write a STATE message, at most once per `state_message_interval`."""
+        interval = float(
+            self.config.get("state_message_interval", STATE_MESSAGE_INTERVAL)
+        )
+        now = time.monotonic()
+        last_written = self._tap._state_message_written_at
+        if not force and last_written is not None and now - last_written < interval:
+            return
+        self._tap._state_message_written_at = now
+        super()._write_state_message()
+
+    def write_records(self, records: Iterable[dict], context: Optional[dict]) -> None:
+        """Write records built outside of `sync`, such as by the game pipeline."""
+        exporter = getattr(self._tap, "exporter", None)
+        parent_partition = self._export_partition
+        self._export_partition = export_partition(context)
+        try:
+            for record in records:
+                if self.track_changes and not self.is_changed(record, context):
+                    continue
+                self._write_record_message(record)
+            if exporter is not None:
+                self._flush_export(exporter)
+        finally:
+            self._export_partition = parent_partition
+
+    def get_records(self, context: Optional[dict]) -> Iterable[Dict[str, Any]]:
+        """Return post-processed records, validated by the compiled validator.
+
+        For streams with change tracking, the RECORD message of a record
+        identical to the version emitted by an earlier run is dropped. The record
+        itself is still yielded, so that its child streams are synced.
+        """
+        for record in super().get_records(context):
+            if self._record_validator:
+                record = self._record_validator(record)
+            for key in self.record_context_keys:
+                record.setdefault(key, (context or {})[key])
+            if self.track_changes:
+                self._suppress_record = not self.is_changed(record, context)
+            yield record
+
+    def change_partition(self, record: dict, context: Optional[dict]) -> str:
+        """Return the season a tracked record is compared and tombstoned within."""
+        context = context or {}
+        if context.get("seasonId"):
+            return str(context["seasonId"])
+        if context.get("gameId"):
+            return season_from_game_id(context["gameId"])
+        return str(record.get("seasonId") or "")
+
+    def is_changed(self, record: dict, context: Optional[dict]) -> bool:
+        """Return True if a tracked record differs from the last run's version."""
+        key = record_key(record, self.primary_keys)
+        partition = self.change_partition(record, context)
+        return self._tap.record_hashes.is_changed(self.name, key, record, partition)
+
+    def write_tombstones(
+        self, keys: Iterable[Tuple[str, str]], deleted_at: str
+    ) -> None:
+        """Emit deletion markers for records missing from this run."""
+        self._suppress_record = False
+        properties = self.schema["properties"]
+        for partition, key in keys:
+            tombstone = dict(zip(self.primary_keys, json.loads(key)))
+            if partition and "seasonId" in properties:
+                tombstone.setdefault("seasonId", partition)
+            tombstone["_sdc_deleted_at"] = deleted_at
+            self._write_record_message(tombstone)
+
     def post_process(self, row: dict, context: Optional[dict]) -> dict:
         """As needed, append or transform raw data to match expected structure."""
         # TODO: Delete this method if not needed.
@@ -0,0 +1,161 @@
+"""Columnar Parquet export of stream records, partitioned by season and game."""
+
+import json
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# pyarrow is optional and slow to import, so it is loaded on first use
+pa: Any = None
+pq: Any = None
+
+PartitionKey = Tuple[Tuple[str, str], ...]
+
+
+def _load_pyarrow() -> None:
+    global pa, pq
+    if pa is not None:
+        return
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError(
+            "Parquet export requires pyarrow: pip install 'tap-nhl[parquet]'"
+        )
+    pa, pq = pyarrow, pyarrow.parquet
+
+
+def _schema_types(schema: dict) -> List[str]:
+    types = schema.get("type", [])
+    types = [types] if isinstance(types, str) else list(types)
+    return [t for t in types if t != "null"]
+
+
+def arrow_type(schema: dict) -> "pa.DataType":
+    """Return the Arrow type for a JSON schema fragment."""
+    types = _schema_types(schema)
+    if "object" in types:
+        properties = schema.get("properties")
+        if not properties:
+            return pa.string()  # free-form objects are stored as JSON text
+        return pa.struct(
+            [pa.field(name, arrow_type(sub)) for name, sub in properties.items()]
+        )
+    if "array" in types:
+        return pa.list_(arrow_type(schema.get("items", {})))
+    if "number" in types:
+        return pa.float64()
+    if "integer" in types:
+        return pa.int64()
+    if "boolean" in types:
+        return pa.bool_()
+    return pa.string()
+
+
+def arrow_schema(schema: dict) -> "pa.Schema":
+    """Return the Arrow schema for a stream's JSON schema."""
+    return pa.schema(
+        [pa.field(name, arrow_type(sub)) for name, sub in schema["properties"].items()]
+    )
+
+
+def _prepare_value(value: Any, schema: dict) -> Any:
+    """Shape a record value so that it matches `arrow_type(schema)`."""
+    if value is None:
+        return None
+    types = _schema_types(schema)
+    if "object" in types:
+        properties = schema.get("properties")
+        if not properties:
+            return json.dumps(value)
+        return {
+            name: _prepare_value(value.get(name), sub)
+            for name, sub in properties.items()
+        }
+    if "array" in types:
+        item_schema = schema.get("items", {})
+        return [_prepare_value(item, item_schema) for item in value]
+    if "number" in types and isinstance(value, int):
+        return float(value)
+    if types == ["string"] and not isinstance(value, str):
+        return str(value)
+    return value
+
+
+def season_from_game_id(game_id: Any) -> str:
+    """Return the season ID (e.g. 20212022) encoded in an NHL game ID."""
+    start_year = int(str(game_id)[0:4])
+    return f"{start_year}{start_year + 1}"
+
+
+def export_partition(context: Optional[dict]) -> PartitionKey:
+    """Return the season/game partition for a stream context."""
+    context = context or {}
+    partition = []
+    season = context.get("seasonId")
+    if season is None and context.get("gameId") is not None:
+        season = season_from_game_id(context["gameId"])
+    if season is not None:
+        partition.append(("season", str(season)))
+    if context.get("gameId") is not None:
+        partition.append(("game", str(context["gameId"])))
+    return tuple(partition)
+
+
+class ParquetExporter:
+    """Buffer records per stream partition and write them as Parquet files."""
+
+    def __init__(self, export_dir: Path, max_buffered_rows: int = 100000) -> None:
+        """Write Parquet files under `export_dir`.
+
+        Up to `max_buffered_rows` rows are buffered per stream partition before
+        they are written as one file.
+        """
+        _load_pyarrow()
+        self.export_dir = Path(export_dir)
+        self.max_buffered_rows = max_buffered_rows
+        self._schemas: Dict[str, Tuple[dict, "pa.Schema"]] = {}
+        self._buffers: Dict[Tuple[str, PartitionKey], List[dict]] = {}
+
+    def add(
+        self, stream_name: str, schema: dict, partition: PartitionKey, record: dict
+    ) -> None:
+        """Buffer one record, writing the partition once the buffer is full."""
+        if stream_name not in self._schemas:
+            self._schemas[stream_name] = (schema, arrow_schema(schema))
+        key = (stream_name, partition)
+        buffer = self._buffers.setdefault(key, [])
+        buffer.append(
+            {
+                name: _prepare_value(record.get(name), sub)
+                for name, sub in schema["properties"].items()
+            }
+        )
+        if len(buffer) >= self.max_buffered_rows:
+            self._write(key)
+
+    def flush(
+        self,
+        stream_name: Optional[str] = None,
+        partition: Optional[PartitionKey] = None,
+    ) -> None:
+        """Write buffered records, optionally limited to one stream/partition."""
+        for key in list(self._buffers):
+            if stream_name is not None and key[0] != stream_name:
+                continue
+            if partition is not None and key[1] != partition:
+                continue
+            self._write(key)
+
+    def _write(self, key: Tuple[str, PartitionKey]) -> None:
+        rows = self._buffers.pop(key, [])
+        if not rows:
+            return
+        stream_name, partition = key
+        directory = self.export_dir / stream_name
+        for name, value in partition:
+            directory = directory / f"{name}={value}"
+        directory.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pylist(rows, schema=self._schemas[stream_name][1])
+        pq.write_table(table, directory / f"part-{uuid.uuid4().hex}.parquet")
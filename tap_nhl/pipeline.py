@@ -0,0 +1,353 @@
+"""Process-pool decoding and post-processing of per-game API responses.
+
+Game-level streams turn one or two large responses per game (the live feed
+and the shift chart) into records. In pipeline mode, I/O threads fetch the raw
+bodies, worker processes decode, extract, post-process, validate and serialize
+the records, and the main process only writes them out in game order.
+"""
+
+import datetime
+import json
+import multiprocessing
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Set, Tuple
+
+from singer_sdk.helpers.jsonpath import extract_jsonpath
+
+from tap_nhl.client import get_cache_dir
+from tap_nhl.validation import SampledValidator, compile_validator
+
+
+def keep_play(play: dict, event_types: Set[str], periods: Set[int]) -> bool:
+    """Return True if a play passes the event type and period filters."""
+    if event_types:
+        if play.get("result", {}).get("eventTypeId") not in event_types:
+            return False
+    if periods:
+        if play.get("about", {}).get("period") not in periods:
+            return False
+    return True
+
+
+def extract_plays(
+    feed: dict, event_types: Set[str], periods: Set[int], normalize: bool
+) -> Iterable[dict]:
+    """Return a game's plays after filtering and optional coordinate normalization."""
+    plays = extract_jsonpath("$.liveData.plays.allPlays[*]", input=feed)
+    if normalize:
+        from tap_nhl.transforms import normalize_play_coordinates
+
+        all_plays = list(plays)
+        kept_plays = [
+            play for play in all_plays if keep_play(play, event_types, periods)
+        ]
+        return normalize_play_coordinates(kept_plays, all_plays)
+    if event_types or periods:
+        return (play for play in plays if keep_play(play, event_types, periods))
+    return plays
+
+
+def flatten_boxscore_players(row: dict) -> dict:
+    """Turn the per-team players objects of a boxscore into lists.
+
+    The stats of each player, keyed by skaterStats or goalieStats, are moved
+    under playerStats so both kinds of player share one schema.
+    """
+    for team_type in ["away", "home"]:
+        player_data = []
+        if row["teams"].get(team_type):
+            if row["teams"][team_type].get("players"):
+                player_ids = row["teams"][team_type]["players"].keys()
+                for player_id in player_ids:
+                    # player stats
+                    if row["teams"][team_type]["players"][player_id].get("stats"):
+                        player_stats_key = list(
+                            row["teams"][team_type]["players"][player_id]["stats"]
+                        )
+                        row["teams"][team_type]["players"][player_id]["stats"][
+                            "playerStats"
+                        ] = row["teams"][team_type]["players"][player_id]["stats"][
+                            player_stats_key[0]
+                        ]
+                        row["teams"][team_type]["players"][player_id]["stats"].pop(
+                            player_stats_key[0]
+                        )
+                    player_data.append(
+                        row["teams"][team_type]["players"][player_id]
+                    )  # append the nested player_ids into a list
+        row["teams"][team_type]["players"] = player_data  # assign back to players
+    return row
+
+
+def extract_shifts(data: dict, normalize: bool) -> List[dict]:
+    """Return a game's shifts, normalized as one batch if enabled."""
+    shifts = list(extract_jsonpath("$.data[*]", input=data))
+    if normalize:
+        from tap_nhl.transforms import normalize_shifts
+
+        shifts = normalize_shifts(shifts)
+    return shifts
+
+
+def _plays(bodies: Dict[str, Any], options: dict) -> Iterable[dict]:
+    return extract_plays(
+        bodies["game_feed"],
+        set(options["event_types"]),
+        set(options["periods"]),
+        options["normalize_play_coordinates"],
+    )
+
+
+def _plays_on_ice(bodies: Dict[str, Any], options: dict) -> Iterable[dict]:
+    from tap_nhl.transforms import annotate_on_ice
+
+    feed = bodies["game_feed"]
+    shifts = extract_jsonpath("$.data[*]", input=bodies["shiftcharts"])
+    return annotate_on_ice(feed["gamePk"], feed, shifts)
+
+
+def _team_stats(bodies: Dict[str, Any], options: dict) -> Iterable[dict]:
+    from tap_nhl.transforms import team_game_stats
+
+    return team_game_stats(bodies["game_feed"]["gamePk"], bodies["game_feed"])
+
+
+def _boxscore(bodies: Dict[str, Any], options: dict) -> Iterable[dict]:
+    rows = extract_jsonpath("$.liveData.boxscore", input=bodies["game_feed"])
+    return (flatten_boxscore_players(row) for row in rows)
+
+
+def _linescore(bodies: Dict[str, Any], options: dict) -> Iterable[dict]:
+    return extract_jsonpath("$.liveData.linescore", input=bodies["game_feed"])
+
+
+def _shifts(bodies: Dict[str, Any], options: dict) -> Iterable[dict]:
+    return extract_shifts(bodies["shiftcharts"], options["normalize_shifts"])
+
+
+# stream name -> function building its records from a game's decoded bodies
+EXTRACTORS: Dict[str, Callable[[Dict[str, Any], dict], Iterable[dict]]] = {
+    "live_plays": _plays,
+    "live_plays_on_ice": _plays_on_ice,
+    "live_team_stats": _team_stats,
+    "live_boxscore": _boxscore,
+    "live_linescore": _linescore,
+    "shifts": _shifts,
+}
+
+
+def conform_record(record: dict, schema: dict) -> dict:
+    """Drop the properties of a record, and of its nested objects, not in `schema`.
+
+    This mirrors the SDK's record conforming, so pre-serialized records match
+    the output of a normal sync.
+    """
+    properties = schema.get("properties", {})
+    conformed = {}
+    for key, value in record.items():
+        if key not in properties:
+            continue
+        conformed[key] = _conform_value(value, properties[key])
+    return conformed
+
+
+def _conform_value(value: Any, schema: dict) -> Any:
+    if isinstance(value, dict) and "properties" in schema:
+        return conform_record(value, schema)
+    if isinstance(value, list) and isinstance(schema.get("items"), dict):
+        return [_conform_value(item, schema["items"]) for item in value]
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return value
+
+
+# worker process state, set up once per process by `_init_worker`
+_SPECS: Dict[str, dict] = {}
+_VALIDATORS: Dict[str, SampledValidator] = {}
+
+
+def _init_worker(specs: Dict[str, dict]) -> None:
+    _SPECS.clear()
+    _SPECS.update(specs)
+    _VALIDATORS.clear()
+    for name, spec in specs.items():
+        if spec["validate"]:
+            _VALIDATORS[name] = SampledValidator(
+                compile_validator(spec["schema"], Path(spec["cache_dir"])),
+                sample_rate=spec["sample_rate"],
+            )
+
+
+def process_game(
+    context: dict, bodies: Dict[str, bytes], stream_names: List[str]
+) -> List[Tuple[str, Any, Any]]:
+    """Build the records of a game's streams from its raw response bodies.
+
+    Returns (stream name, records, last replication key value) per stream.
+    Records are a ready-to-write block of RECORD messages for pre-serialized
+    streams, or a list of record dicts otherwise.
+    """
+    decoded = {kind: json.loads(body) for kind, body in bodies.items()}
+    time_extracted = datetime.datetime.now(datetime.timezone.utc).strftime(
+        "%Y-%m-%dT%H:%M:%S.%fZ"
+    )
+    results: List[Tuple[str, Any, Any]] = []
+    for name in stream_names:
+        spec = _SPECS[name]
+        validator = _VALIDATORS.get(name)
+        selected = spec["selected_properties"]
+        records = []
+        for record in EXTRACTORS[name](decoded, spec["options"]):
+            if validator:
+                record = validator(record)
+            for key in spec["record_context_keys"]:
+                record.setdefault(key, context[key])
+            record = conform_record(record, spec["schema"])
+            if selected is not None:
+                record = {
+                    key: value for key, value in record.items() if key in selected
+                }
+            records.append(record)
+        replication_key = spec["replication_key"]
+        bookmark = None
+        if records and replication_key:
+            bookmark = records[-1].get(replication_key)
+        if spec["preserialize"]:
+            lines = [
+                json.dumps(
+                    {
+                        "type": "RECORD",
+                        "stream": name,
+                        "record": record,
+                        "time_extracted": time_extracted,
+                    },
+                    default=str,
+                )
+                for record in records
+            ]
+            results.append((name, "".join(line + "\n" for line in lines), bookmark))
+        else:
+            results.append((name, records, bookmark))
+    return results
+
+
+class GamePipeline:
+    """Fetch, process and write the pipelined child streams of each game.
+
+    Games are submitted in order; up to `window` games are in flight, and their
+    records are written in submission order as soon as the oldest completes.
+    """
+
+    def __init__(
+        self,
+        streams: List[Any],
+        workers: int,
+        fetch_workers: int,
+        preserialize: bool,
+        logger: Any,
+    ) -> None:
+        """Start `fetch_workers` fetch threads and `workers` worker processes.
+
+        The workers build the records of the per-game `streams`. With
+        `preserialize`, they also serialize the RECORD messages of streams that
+        do not need record dicts in the main process.
+        """
+        self.streams = {stream.name: stream for stream in streams}
+        self.logger = logger
+        self.window = 2 * (workers + fetch_workers)
+        specs = {
+            name: self._spec(stream, preserialize)
+            for name, stream in self.streams.items()
+        }
+        # fetch threads submit to the pool, so workers must not be forked from
+        # a process whose other threads may hold locks
+        start_method = (
+            "forkserver"
+            if "forkserver" in multiprocessing.get_all_start_methods()
+            else "spawn"
+        )
+        self._processes = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(specs,),
+        )
+        self._fetchers = ThreadPoolExecutor(
+            max_workers=fetch_workers, thread_name_prefix="tap-nhl-fetch"
+        )
+        self._pending: Deque[Tuple[dict, Future]] = deque()
+        self._schemas_written: Set[str] = set()
+
+    @staticmethod
+    def _spec(stream: Any, preserialize: bool) -> dict:
+        properties = stream.schema.get("properties", {})
+        selected = {
+            name for name in properties if stream.mask.get(("properties", name), True)
+        }
+        return {
+            "options": stream.pipeline_options(),
+            "schema": stream.schema,
+            "replication_key": stream.replication_key,
+            "record_context_keys": stream.record_context_keys,
+            "validate": bool(stream.config.get("validate_records")),
+            "sample_rate": float(stream.config.get("validation_sample_rate", 1.0)),
+            "cache_dir": str(get_cache_dir(stream.config)),
+            "selected_properties": None if selected == set(properties) else selected,
+            "preserialize": preserialize and not stream.track_changes,
+        }
+
+    def _fetch(self, context: dict, requests_by_kind: dict) -> Future:
+        bodies = {}
+        for kind, (stream, prepared_request) in requests_by_kind.items():
+            decorated_request = stream.request_decorator(stream._archived_request)
+            bodies[kind] = decorated_request(prepared_request, context).content
+        return self._processes.submit(process_game, context, bodies, list(self.streams))
+
+    def submit(self, context: dict) -> None:
+        """Queue a game, writing finished games while the window is full."""
+        requests_by_kind: Dict[str, Tuple[Any, Any]] = {}
+        for stream in self.streams.values():
+            for kind, prepared_request in stream.game_requests(context).items():
+                requests_by_kind.setdefault(kind, (stream, prepared_request))
+        self._pending.append(
+            (context, self._fetchers.submit(self._fetch, context, requests_by_kind))
+        )
+        while len(self._pending) >= self.window or (
+            self._pending
+            and self._pending[0][1].done()
+            and self._pending[0][1].result().done()
+        ):
+            self._write_oldest()
+
+    def _write_oldest(self) -> None:
+        context, fetched = self._pending.popleft()
+        for name, records, bookmark in fetched.result().result():
+            stream = self.streams[name]
+            if name not in self._schemas_written:
+                stream._write_schema_message()
+                self._schemas_written.add(name)
+            if isinstance(records, str):
+                sys.stdout.write(records)
+                sys.stdout.flush()
+            else:
+                stream.write_records(records, context)
+            if bookmark is not None:
+                stream._increment_stream_state(
+                    {stream.replication_key: bookmark}, context=context
+                )
+
+    def drain(self) -> None:
+        """Write every game still in flight."""
+        while self._pending:
+            self._write_oldest()
+
+    def close(self) -> None:
+        """Write the remaining games and shut the worker pools down."""
+        try:
+            self.drain()
+        finally:
+            self._fetchers.shutdown()
+            self._processes.shutdown()
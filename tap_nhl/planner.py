@@ -0,0 +1,150 @@
+"""Dry-run request planning and cost estimation for a configured sync."""
+
+import json
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from singer_sdk import Stream
+
+# Rough response sizes and latencies per request, used for endpoints that the
+# planner does not fetch itself. Fetched parent endpoints use measured sizes.
+ESTIMATED_RESPONSE_BYTES = {
+    "conferences": 2_000,
+    "divisions": 3_000,
+    "seasons": 1_000,
+    "schedule": 1_500_000,
+    "teams": 150_000,
+    "people": 2_000,
+    "draft": 250_000,
+    "draft_prospects": 2_000,
+    "game_feed": 1_500_000,
+    "shiftcharts": 400_000,
+}
+ESTIMATED_LATENCY_SECONDS = {
+    "schedule": 1.0,
+    "teams": 0.8,
+    "draft": 0.8,
+    "game_feed": 0.8,
+    "shiftcharts": 0.6,
+}
+DEFAULT_LATENCY_SECONDS = 0.3
+# Per-game endpoints and the streams reading them. Streams sharing an endpoint
+# reuse one response per game, so each endpoint costs one request per game.
+GAME_ENDPOINTS = {
+    "game_feed": [
+        "live_plays",
+        "live_plays_on_ice",
+        "live_boxscore",
+        "live_linescore",
+        "live_team_stats",
+    ],
+    "shiftcharts": ["shifts", "live_plays_on_ice"],
+}
+
+
+def season_ids(start_year: int, end_year: int) -> List[str]:
+    """Return the season IDs visited by SeasonsStream for a year range."""
+    return [
+        f"{year}{year + 1}" for year in range(start_year, max(end_year, start_year + 1))
+    ]
+
+
+class RequestPlanner:
+    """Enumerate the request graph of a sync using only cheap parent endpoints."""
+
+    def __init__(self, streams: Dict[str, Stream], config: dict) -> None:
+        """Plan the requests of the selected `streams` for the tap `config`."""
+        self.streams = streams
+        self.config = config
+        self.requests: Counter = Counter()
+        self.bytes: Counter = Counter()
+
+    def _needed(self) -> Set[str]:
+        needed = set()
+        for name, stream in self.streams.items():
+            if not stream.selected:
+                continue
+            while stream is not None:
+                needed.add(stream.name)
+                parent_type = stream.parent_stream_type
+                stream = self.streams.get(parent_type.name) if parent_type else None
+        return needed
+
+    def _add(self, name: str, count: int = 1, size: Optional[int] = None) -> None:
+        self.requests[name] += count
+        if size is None:
+            size = ESTIMATED_RESPONSE_BYTES.get(name, 0) * count
+        self.bytes[name] += size
+
+    def _fetch(self, name: str, context: dict) -> Any:
+        """Fetch a parent endpoint, recording its measured size."""
+        stream = self.streams[name]
+        prepared_request = stream.prepare_request(context, next_page_token=None)
+        body = stream.request_body(prepared_request, context)
+        self._add(name, size=len(body))
+        return json.loads(body)
+
+    def plan(self) -> Dict[str, Any]:
+        """Return request counts, bytes and wall time estimates per stream."""
+        needed = self._needed()
+        for name in ["conferences", "divisions"]:
+            if name in needed:
+                self._add(name)
+        seasons = season_ids(
+            int(self.config["start_year"]), int(self.config["end_year"])
+        )
+        if "seasons" in needed:
+            self._add("seasons", len(seasons))
+        game_endpoints = [
+            endpoint
+            for endpoint, stream_names in GAME_ENDPOINTS.items()
+            if needed.intersection(stream_names)
+        ]
+        for season_id in seasons:
+            self._plan_season(season_id, needed, game_endpoints)
+        return self.report()
+
+    def _plan_season(
+        self, season_id: str, needed: Set[str], game_endpoints: List[str]
+    ) -> None:
+        """Count the requests below one season's schedule, teams and draft."""
+        if "schedule" in needed:
+            schedule = self._fetch("schedule", {"seasonId": season_id})
+            games = self._count(schedule.get("dates", []), "games")
+            for endpoint in game_endpoints:
+                self._add(endpoint, games)
+        if "teams" in needed:
+            teams = self._fetch("teams", {"seasonId": season_id})
+            if "people" in needed:
+                rosters = (team.get("roster", {}) for team in teams.get("teams", []))
+                self._add("people", self._count(rosters, "roster"))
+        if "draft" in needed:
+            draft = self._fetch("draft", {"seasonId": season_id})
+            if "draft_prospects" in needed:
+                rounds = (
+                    draft_round
+                    for year in draft.get("drafts", [])
+                    for draft_round in year.get("rounds", [])
+                )
+                self._add("draft_prospects", self._count(rounds, "picks"))
+
+    @staticmethod
+    def _count(parents: Iterable[dict], key: str) -> int:
+        return sum(len(parent.get(key) or []) for parent in parents)
+
+    def report(self) -> Dict[str, Any]:
+        """Summarise the planned requests per endpoint at the configured concurrency."""
+        concurrency = max(int(self.config.get("plan_concurrency", 1)), 1)
+        endpoints = {}
+        request_seconds = 0.0
+        for name, count in sorted(self.requests.items()):
+            latency = ESTIMATED_LATENCY_SECONDS.get(name, DEFAULT_LATENCY_SECONDS)
+            request_seconds += count * latency
+            endpoints[name] = {"requests": count, "bytes": self.bytes[name]}
+        return {
+            "endpoints": endpoints,
+            "total_requests": sum(self.requests.values()),
+            "total_bytes": sum(self.bytes.values()),
+            "concurrency": concurrency,
+            "estimated_seconds": round(request_seconds / concurrency, 1),
+        }
@@ -0,0 +1,176 @@
+"""Per-stream CPU and memory profiling of a sync."""
+
+import cProfile
+import logging
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+TOP_ALLOCATIONS = 25
+# a stream's allocation snapshot is only retaken once traced memory grew this much
+SNAPSHOT_PEAK_GROWTH = 1.25
+
+
+class SyncProfiler:
+    """Profile each stream's sync separately, including nested child syncs.
+
+    Child streams sync inside their parent's `sync`, so the profiler keeps a
+    stack of active streams: the parent's deterministic profiler is paused while
+    a child runs and every sample or allocation peak is attributed to the
+    innermost stream. For each stream it writes:
+
+    - `<stream>.pstats`: deterministic profile, readable with `pstats`/snakeviz
+    - `<stream>.collapsed`: sampled stacks in collapsed format for flamegraph.pl
+      or speedscope
+    - `<stream>.memory.txt`: peak traced memory and the top allocation sites
+      near that peak
+
+    The sampling thread also watches the traced memory and snapshots the
+    allocations while a stream reaches a new peak. Snapshots are slow, so one
+    is only retaken when the traced memory grew well above that of the
+    stream's previous snapshot. A stream too short to be sampled is
+    snapshotted at the end of its sync.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        sample_interval: float = 0.005,
+        trace_memory: bool = True,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """Set up a profiler writing its reports to `output_dir`.
+
+        Stacks are sampled every `sample_interval` seconds, allocations are
+        traced with tracemalloc if `trace_memory` is set, and a summary per
+        stream is logged to `logger` (the module logger by default).
+        """
+        self.output_dir = Path(output_dir)
+        self.sample_interval = sample_interval
+        self.trace_memory = trace_memory
+        self.logger = logger or logging.getLogger(__name__)
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._samples: Dict[str, Counter] = {}
+        self._peak_memory: Dict[str, int] = {}
+        self._snapshots: Dict[str, tracemalloc.Snapshot] = {}
+        self._snapshot_peaks: Dict[str, int] = {}
+        self._stack: List[str] = []
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start memory tracing and the stack sampling thread."""
+        self._thread_id = threading.get_ident()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._sampler = threading.Thread(
+            target=self._sample, name="tap-nhl-profiler", daemon=True
+        )
+        self._sampler.start()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.sample_interval):
+            # the sync thread pushes and pops streams while this thread runs
+            stack = tuple(self._stack)
+            frame = sys._current_frames().get(self._thread_id)
+            if not stack or frame is None:
+                continue
+            stream_name = stack[-1]
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({Path(code.co_filename).name})")
+                frame = frame.f_back
+            stream_samples = self._samples.setdefault(stream_name, Counter())
+            stream_samples[";".join(reversed(frames))] += 1
+            if self.trace_memory:
+                self._snapshot_peak(stream_name)
+
+    def _snapshot_peak(self, stream_name: str) -> None:
+        """Snapshot the allocations if traced memory reached a new stream peak."""
+        current = tracemalloc.get_traced_memory()[0]
+        snapshot_peak = self._snapshot_peaks.get(stream_name)
+        if snapshot_peak is None or current > SNAPSHOT_PEAK_GROWTH * snapshot_peak:
+            self._snapshot_peaks[stream_name] = current
+            self._snapshots[stream_name] = tracemalloc.take_snapshot()
+
+    def _pause(self, stream_name: str, ended: bool = False) -> None:
+        self._profiles[stream_name].disable()
+        if not self.trace_memory:
+            return
+        peak = tracemalloc.get_traced_memory()[1]
+        if peak > self._peak_memory.get(stream_name, -1):
+            self._peak_memory[stream_name] = peak
+        if ended and stream_name not in self._snapshots:
+            self._snapshot_peak(stream_name)
+
+    def _resume(self, stream_name: str) -> None:
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        self._profiles.setdefault(stream_name, cProfile.Profile()).enable()
+
+    @contextmanager
+    def profile(self, stream_name: str) -> Iterator[None]:
+        """Attribute everything run inside the block to `stream_name`."""
+        if self._stack:
+            self._pause(self._stack[-1])
+        self._stack.append(stream_name)
+        self._resume(stream_name)
+        try:
+            yield
+        finally:
+            self._pause(stream_name, ended=True)
+            self._stack.pop()
+            if self._stack:
+                self._resume(self._stack[-1])
+
+    def close(self) -> None:
+        """Stop sampling and write the per-stream profile artifacts."""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for stream_name, profile in self._profiles.items():
+            profile.dump_stats(str(self.output_dir / f"{stream_name}.pstats"))
+            self._write_collapsed(stream_name)
+            if self.trace_memory:
+                self._write_memory(stream_name)
+            self._log_hottest(stream_name, profile)
+
+    def _write_collapsed(self, stream_name: str) -> None:
+        samples = self._samples.get(stream_name, Counter())
+        lines = [f"{stack} {count}" for stack, count in samples.most_common()]
+        (self.output_dir / f"{stream_name}.collapsed").write_text("\n".join(lines))
+
+    def _write_memory(self, stream_name: str) -> None:
+        lines = [f"peak traced memory: {self._peak_memory.get(stream_name, 0)} bytes"]
+        snapshot = self._snapshots.get(stream_name)
+        if snapshot is not None:
+            lines.append(
+                f"top {TOP_ALLOCATIONS} allocation sites at a traced memory of "
+                f"{self._snapshot_peaks[stream_name]} bytes:"
+            )
+            statistics = snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+            lines.extend(str(statistic) for statistic in statistics)
+        (self.output_dir / f"{stream_name}.memory.txt").write_text("\n".join(lines))
+
+    def _log_hottest(self, stream_name: str, profile: cProfile.Profile) -> None:
+        stats = pstats.Stats(profile).sort_stats("tottime")
+        if not stats.fcn_list:  # type: ignore[attr-defined]
+            return
+        function = stats.fcn_list[0]  # type: ignore[attr-defined]
+        total_time = stats.stats[function][2]  # type: ignore[attr-defined]
+        filename, line, name = function
+        self.logger.info(
+            f"Profile '{stream_name}': hottest function {name} "
+            f"({filename}:{line}) with {total_time:.3f}s own time, "
+            f"peak memory {self._peak_memory.get(stream_name, 0)} bytes"
+        )
@@ -0,0 +1,70 @@
+"""Local store of raw reference-data responses shared across tap runs."""
+
+import datetime
+import math
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+SEASON_CLOSED_MONTH = 10  # the latest Stanley Cup final ended on 28 Sep 2020
+
+
+def season_closed_at(season_id: str) -> datetime.datetime:
+    """Return the UTC time from which a season (e.g. "20192020") cannot change."""
+    end_year = int(str(season_id)[4:8])
+    return datetime.datetime(
+        end_year, SEASON_CLOSED_MONTH, 1, tzinfo=datetime.timezone.utc
+    )
+
+
+class ReferenceCache:
+    """SQLite-backed response bodies keyed by request URL.
+
+    Entries are stored with their fetch time and a lookup passes the TTL that
+    applies to it. A lookup may also pass the time from which the response can
+    no longer change (a closed season): entries fetched after it never expire,
+    while older entries still follow the TTL.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Open or create the SQLite cache at `path`."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(path))
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, fetched_at REAL NOT NULL, body BLOB NOT NULL)"
+        )
+        self._connection.commit()
+
+    def get(
+        self, key: str, ttl: float, immutable_after: Optional[float] = None
+    ) -> Optional[bytes]:
+        """Return a cached body younger than `ttl` seconds, or None.
+
+        Bodies fetched at or after the `immutable_after` timestamp are returned
+        regardless of their age.
+        """
+        row = self._connection.execute(
+            "SELECT fetched_at, body FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        fetched_at, body = row
+        if immutable_after is not None and fetched_at >= immutable_after:
+            return bytes(body)
+        if not math.isinf(ttl) and time.time() - fetched_at > ttl:
+            return None
+        return bytes(body)
+
+    def put(self, key: str, body: bytes) -> None:
+        """Store a response body, replacing any previous version."""
+        self._connection.execute(
+            "INSERT OR REPLACE INTO responses (key, fetched_at, body) VALUES (?, ?, ?)",
+            (key, time.time(), body),
+        )
+        self._connection.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._connection.close()
@@ -0,0 +1,61 @@
+"""Priority ordering and time budgeting of game-level work."""
+
+import datetime
+import time
+from typing import Collection, Optional, Tuple
+
+LIVE_PRIORITY = 0
+RECENTLY_FINAL_PRIORITY = 1
+DEFERRED_PRIORITY = 2
+HISTORICAL_PRIORITY = 3
+SCHEDULED_PRIORITY = 4  # not started yet, so the game feeds are still empty
+
+
+def game_start(game: dict) -> datetime.datetime:
+    """Return the scheduled start of a schedule record as an aware datetime."""
+    return datetime.datetime.fromisoformat(game["gameDate"].replace("Z", "+00:00"))
+
+
+def game_priority(
+    game: dict,
+    deferred: Collection[int],
+    now: datetime.datetime,
+    recent: datetime.timedelta,
+) -> Tuple[int, float]:
+    """Return a sort key ranking live, recently final, deferred, then older games.
+
+    Games within a rank are ordered most recent first.
+    """
+    state = (game.get("status") or {}).get("abstractGameState")
+    start = game_start(game)
+    if state == "Live":
+        rank = LIVE_PRIORITY
+    elif state == "Preview":
+        rank = SCHEDULED_PRIORITY
+    elif state == "Final" and start >= now - recent:
+        rank = RECENTLY_FINAL_PRIORITY
+    elif game["gamePk"] in deferred:
+        rank = DEFERRED_PRIORITY
+    else:
+        rank = HISTORICAL_PRIORITY
+    return rank, -start.timestamp()
+
+
+class TimeBudget:
+    """Wall clock budget for game-level work, started on first use."""
+
+    def __init__(self, seconds: Optional[float]) -> None:
+        """Create a budget of `seconds`, or an unbounded one if None."""
+        self.seconds = seconds
+        self._deadline: Optional[float] = None
+
+    def start(self) -> None:
+        """Start the clock if the budget is bounded and not yet running."""
+        if self.seconds is not None and self._deadline is None:
+            self._deadline = time.monotonic() + self.seconds
+
+    @property
+    def exhausted(self) -> bool:
+        """Return True once a bounded budget has run out."""
+        self.start()
+        return self._deadline is not None and time.monotonic() >= self._deadline
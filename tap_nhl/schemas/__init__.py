@@ -0,0 +1 @@
+"""JSON schemas of the tap-nhl streams."""
@@ -0,0 +1,22 @@
+"""JSON schema of the `live_plays_on_ice` stream."""
+
+import singer_sdk.typing as th
+
+
+class LivePlaysOnIceObject:
+    """Properties of a `live_plays_on_ice` record."""
+
+    schema = th.PropertiesList(
+        th.Property("gameId", th.IntegerType),
+        th.Property("eventIdx", th.IntegerType),
+        th.Property("eventId", th.IntegerType),
+        th.Property("eventTypeId", th.StringType),
+        th.Property("period", th.IntegerType),
+        th.Property("periodTime", th.StringType),
+        th.Property("periodSeconds", th.IntegerType),
+        th.Property("teamId", th.IntegerType),
+        th.Property("homeTeamId", th.IntegerType),
+        th.Property("awayTeamId", th.IntegerType),
+        th.Property("homeOnIce", th.ArrayType(th.IntegerType)),
+        th.Property("awayOnIce", th.ArrayType(th.IntegerType)),
+    ).to_dict()
@@ -0,0 +1,45 @@
+"""JSON schema of the `live_team_stats` stream."""
+
+import singer_sdk.typing as th
+
+
+class LiveTeamStatsObject:
+    """Properties of a `live_team_stats` record."""
+
+    schema = th.PropertiesList(
+        th.Property("gameId", th.IntegerType),
+        th.Property("teamId", th.IntegerType),
+        th.Property("teamTriCode", th.StringType),
+        th.Property("opponentTeamId", th.IntegerType),
+        th.Property("isHome", th.BooleanType),
+        th.Property("goalsFor", th.IntegerType),
+        th.Property("goalsAgainst", th.IntegerType),
+        th.Property("shotsFor", th.IntegerType),
+        th.Property("shotsAgainst", th.IntegerType),
+        th.Property("corsiFor", th.IntegerType),
+        th.Property("corsiAgainst", th.IntegerType),
+        th.Property("fenwickFor", th.IntegerType),
+        th.Property("fenwickAgainst", th.IntegerType),
+        th.Property("highDangerFor", th.IntegerType),
+        th.Property("highDangerAgainst", th.IntegerType),
+        th.Property("corsiForLeading", th.IntegerType),
+        th.Property("corsiForTied", th.IntegerType),
+        th.Property("corsiForTrailing", th.IntegerType),
+        th.Property("corsiAgainstLeading", th.IntegerType),
+        th.Property("corsiAgainstTied", th.IntegerType),
+        th.Property("corsiAgainstTrailing", th.IntegerType),
+        th.Property(
+            "periods",
+            th.ArrayType(
+                th.ObjectType(
+                    th.Property("period", th.IntegerType),
+                    th.Property("goalsFor", th.IntegerType),
+                    th.Property("shotsFor", th.IntegerType),
+                    th.Property("corsiFor", th.IntegerType),
+                    th.Property("corsiAgainst", th.IntegerType),
+                    th.Property("fenwickFor", th.IntegerType),
+                    th.Property("fenwickAgainst", th.IntegerType),
+                )
+            ),
+        ),
+    ).to_dict()
@@ -1,6 +1,11 @@
+"""JSON schema of the `people` stream."""
+
 import singer_sdk.typing as th
 
-class PeopleObject():
+
+class PeopleObject:
+    """Properties of a `people` record."""
+
     schema = th.PropertiesList(
         th.Property("id", th.IntegerType),
         th.Property("fullName", th.StringType),
@@ -21,12 +26,15 @@ class PeopleObject():
         th.Property("rookie", th.BooleanType),
         th.Property("shootsCatches", th.StringType),
         th.Property("rosterStatus", th.StringType),
-        th.Property("primaryPosition", th.ObjectType(
-            th.Property("code", th.StringType),
-            th.Property("name", th.StringType),
-            th.Property("type", th.StringType),
-            th.Property("abbreviation", th.StringType),
-        )),
+        th.Property(
+            "primaryPosition",
+            th.ObjectType(
+                th.Property("code", th.StringType),
+                th.Property("name", th.StringType),
+                th.Property("type", th.StringType),
+                th.Property("abbreviation", th.StringType),
+            ),
+        ),
         th.Property("seasonId", th.StringType),
         th.Property("teamId", th.IntegerType),
     ).to_dict()
@@ -1,6 +1,11 @@
+"""JSON schema of the `seasons` stream."""
+
 import singer_sdk.typing as th
 
-class SeasonsObject():
+
+class SeasonsObject:
+    """Properties of a `seasons` record."""
+
     schema = th.PropertiesList(
         th.Property("seasonId", th.StringType),
         th.Property("regularSeasonStartDate", th.StringType),
@@ -1,6 +1,11 @@
+"""JSON schema of the `shifts` stream."""
+
 import singer_sdk.typing as th
 
-class ShiftsObject():
+
+class ShiftsObject:
+    """Properties of a `shifts` record."""
+
     schema = th.PropertiesList(
         th.Property("id", th.IntegerType()),
         th.Property("detailCode", th.IntegerType()),
@@ -20,5 +25,13 @@ class ShiftsObject():
         th.Property("teamAbbrev", th.StringType()),
         th.Property("teamId", th.IntegerType()),
         th.Property("teamName", th.StringType()),
-        th.Property("typeCode", th.IntegerType())
+        th.Property("typeCode", th.IntegerType()),
+        # populated when the `normalize_shifts` setting is enabled
+        th.Property("durationSeconds", th.IntegerType()),
+        th.Property("startTimeSeconds", th.IntegerType()),
+        th.Property("endTimeSeconds", th.IntegerType()),
+        th.Property("gameStartSeconds", th.IntegerType()),
+        th.Property("gameEndSeconds", th.IntegerType()),
+        th.Property("playerGameToiSeconds", th.IntegerType()),
+        th.Property("playerGameShiftCount", th.IntegerType()),
     ).to_dict()
@@ -0,0 +1,28 @@
+"""Compact encodings for the per-game parts of the tap state."""
+
+from typing import Iterable, Optional, Set
+
+
+def encode_ranges(values: Iterable[int]) -> str:
+    """Encode integers as sorted, comma-separated runs, e.g. "1-3,7,9-10"."""
+    runs = []
+    start = previous = None
+    for value in sorted(set(values)):
+        if previous is not None and value == previous + 1:
+            previous = value
+            continue
+        if start is not None:
+            runs.append(str(start) if start == previous else f"{start}-{previous}")
+        start = previous = value
+    if start is not None:
+        runs.append(str(start) if start == previous else f"{start}-{previous}")
+    return ",".join(runs)
+
+
+def decode_ranges(encoded: Optional[str]) -> Set[int]:
+    """Decode a string produced by `encode_ranges` back to a set of integers."""
+    values: Set[int] = set()
+    for run in filter(None, (encoded or "").split(",")):
+        start, _, end = run.partition("-")
+        values.update(range(int(start), int(end or start) + 1))
+    return values
@@ -1,261 +1,456 @@
 """Stream type classes for tap-nhl."""
-import copy
-from typing import Any, Dict, Optional, Union, List, Iterable, cast
-
-from tap_nhl.client import nhlStream
-from tap_nhl.schemas.shifts import ShiftsObject
-from tap_nhl.schemas.conferences import ConferencesObject
-from tap_nhl.schemas.seasons import SeasonsObject
-from tap_nhl.schemas.schedule import ScheduleObject
-from tap_nhl.schemas.live_plays import LivePlaysObject
-from tap_nhl.schemas.live_boxscore import LiveBoxscoreObject
-from tap_nhl.schemas.live_linescore import LiveLinescoreObject
-from tap_nhl.schemas.teams import TeamsObject
-from tap_nhl.schemas.divisions import DivisionsObject
-from tap_nhl.schemas.draft import DraftObject
-from tap_nhl.schemas.draft_prospects import DraftProspectsObject
-from tap_nhl.schemas.people import PeopleObject
+
+import datetime
+from collections import ChainMap
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set
+
+import requests
+from singer_sdk.helpers.jsonpath import extract_jsonpath
+
+from tap_nhl.client import LazySchema, compile_url_template, nhlStream
+from tap_nhl.export import season_from_game_id
+from tap_nhl.pipeline import extract_plays, extract_shifts, flatten_boxscore_players
+from tap_nhl.planner import season_ids
+from tap_nhl.reference_cache import season_closed_at
+from tap_nhl.scheduling import game_priority
+from tap_nhl.state import decode_ranges, encode_ranges
+
+SHIFTS_URL_BASE = "https://api.nhle.com/stats/rest/en"
+DAY_SECONDS = 24 * 60 * 60
+
 
 class ConferencesStream(nhlStream):
+    """NHL conferences."""
+
     name = "conferences"
     path = "/conferences"
     primary_keys = ["id"]
     records_jsonpath = "$.conferences[*]"
     replication_key = "id"
-    schema = ConferencesObject.schema
+    schema = LazySchema("conferences", "ConferencesObject")
+    reference_ttl = 7 * DAY_SECONDS
 
 
 class SeasonsStream(nhlStream):
+    """One record per season between `start_year` and `end_year`."""
+
     name = "seasons"
-    path = "/seasons"
+    path = "/seasons/{current_season}"
     primary_keys = ["seasonId"]
     records_jsonpath = "$.seasons[*]"
     replication_key = "seasonId"
-    schema = SeasonsObject.schema
+    schema = LazySchema("seasons", "SeasonsObject")
+    reference_ttl = DAY_SECONDS
+
+    def get_reference_immutable_after(self, context: Optional[dict]) -> Optional[float]:
+        """Treat a season fetched after it closed as never changing."""
+        context = context or {}
+        return season_closed_at(context["current_season"]).timestamp()
 
     def request_records(self, context: Optional[dict]) -> Iterable[dict]:
+        """Request each configured season, newest first if prioritizing."""
         context = context if context else {}
-        start_year = int(self.config.get("start_year"))
-        current_year = start_year
-        next_year = start_year + 1
-        context["current_season"] = str(current_year) + str(next_year)
-        context["next_season"] = str(next_year) + str(next_year + 1)
-        end_year = int(self.config.get("end_year"))
-        finished = False
+        seasons = season_ids(
+            int(self.config.get("start_year")), int(self.config.get("end_year"))
+        )
+        if self.config.get("prioritize_recent_games"):
+            # newest seasons first, so their games are synced before older ones
+            seasons.reverse()
         decorated_request = self.request_decorator(self._request)
 
-        while not finished:
-            prepared_request = self.prepare_request(context, next_page_token=None)
-            resp = decorated_request(prepared_request, context)
-            for row in self.parse_response(resp):
-                yield row
-            # Cycle until the next_date is after the specified end date
-            current_year = next_year
-            next_year = current_year + 1
-            context["current_season"] = str(current_year) + str(next_year)
+        for season_id in seasons:
+            next_year = int(season_id[4:8])
+            context["current_season"] = season_id
             context["next_season"] = str(next_year) + str(next_year + 1)
-            finished = next_year > end_year
-
-    def get_url(self, context: Optional[dict]) -> str:
-        url = "".join([self.url_base, self.path or ""])
-        vals = copy.copy(dict(self.config))
-        vals.update(context or {})
-        for k, v in vals.items():
-            search_text = "".join(["{", k, "}"])
-            if search_text in url:
-                url = url.replace(search_text, self._url_encode(v))
-        url = url + f"/{context['current_season']}"
-        return url
+            prepared_request = self.prepare_request(context, next_page_token=None)
+            if self.get_reference_ttl(context) is not None:
+                data = self.request_json(prepared_request, context)
+                yield from extract_jsonpath(self.records_jsonpath, input=data)
+            else:
+                resp = decorated_request(prepared_request, context)
+                for row in self.parse_response(resp):
+                    yield row
 
     def get_child_context(self, record: dict, context: Optional[dict]) -> dict:
         """Return a context dictionary for child streams."""
-        return {
-            "seasonId": record["seasonId"]
-        }
+        return {"seasonId": record["seasonId"]}
 
 
 class ScheduleStream(nhlStream):
+    """Games of each season; the parent of the per-game streams."""
+
     name = "schedule"
     path = "/schedule"
     primary_keys = ["gamePk"]
     records_jsonpath = "$.dates[*].games[*]"
     parent_stream_type = SeasonsStream
-    schema = ScheduleObject.schema
+    schema = LazySchema("schedule", "ScheduleObject")
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Initialize the stream with no deferred or completed games loaded yet."""
+        super().__init__(*args, **kwargs)
+        self._deferred_games: Optional[Set[int]] = None
+        # the season partition being synced and its completed games
+        self._season_state: Optional[dict] = None
+        self._completed_games: Set[int] = set()
+        self._current_game: dict = {}
+        self._in_flight: List[dict] = []
 
     def get_url_params(
         self, context: Optional[dict], next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
         """Return a dictionary of values to be used in URL parameterization."""
+        context = context or {}
         params = super().get_url_params(context, next_page_token)
-        params.update(
-            {
-                "season": context["seasonId"]
-            }
-        )
+        params.update({"season": context["seasonId"]})
         return params
 
     def get_child_context(self, record: dict, context: Optional[dict]) -> dict:
         """Return a context dictionary for child streams."""
-        return {
-            "gameId": record["gamePk"]
-        }
+        return {"gameId": record["gamePk"]}
+
+    @property
+    def deferred_games(self) -> Set[int]:
+        """Return the games whose child streams an earlier run deferred.
+
+        Games of seasons outside the configured range would never be retried,
+        so they are dropped.
+        """
+        if self._deferred_games is None:
+            seasons = season_ids(
+                int(self.config.get("start_year")), int(self.config.get("end_year"))
+            )
+            self._deferred_games = {
+                game_id
+                for game_id in decode_ranges(self.stream_state.get("deferred_games"))
+                if season_from_game_id(game_id) in seasons
+            }
+        return self._deferred_games
+
+    def _start_season(self, context: Optional[dict]) -> None:
+        self.flush_game_state()
+        self._season_state = self.get_context_state(context)
+        self._completed_games = decode_ranges(self._season_state.get("completed_games"))
+
+    def _complete_game(self, game: dict) -> None:
+        if (game.get("status") or {}).get("abstractGameState") != "Final":
+            return
+        self._completed_games.add(game["gamePk"])
+
+    def flush_game_state(self) -> None:
+        """Write the in-memory deferred and completed games to the state."""
+        if self._deferred_games is not None:
+            self.stream_state["deferred_games"] = encode_ranges(self._deferred_games)
+        if self._season_state is not None:
+            self._season_state["completed_games"] = encode_ranges(self._completed_games)
+
+    def _write_state_message(self, force: bool = False) -> None:
+        """Flush the compact game state before it is emitted."""
+        self.flush_game_state()
+        super()._write_state_message(force)
+
+    def get_records(self, context: Optional[dict]) -> Iterable[Dict[str, Any]]:
+        """Return the season's games, highest priority first when enabled."""
+        self._start_season(context)
+        records = super().get_records(context)
+        if self.config.get("prioritize_recent_games"):
+            now = datetime.datetime.now(datetime.timezone.utc)
+            recent = datetime.timedelta(
+                days=float(self.config.get("recent_game_days", 3))
+            )
+            records = sorted(
+                records,
+                key=lambda game: game_priority(game, self.deferred_games, now, recent),
+            )
+        for record in records:
+            self._current_game = record
+            yield record
+        if self._tap.game_pipeline is not None:
+            # children of the season's last games are still in flight
+            self._tap.game_pipeline.drain()
+            for game in self._in_flight:
+                self._complete_game(game)
+            self._in_flight = []
+
+    def _sync_game(self, child_context: dict) -> None:
+        """Sync a game's children, handing pipelined streams to the game pipeline."""
+        pipeline = self._tap.game_pipeline
+        if pipeline is None:
+            super()._sync_children(child_context)
+            self._complete_game(self._current_game)
+            return
+        pipeline.submit(child_context)
+        for child_stream in self.child_streams:
+            if child_stream.name in pipeline.streams:
+                continue
+            if child_stream.selected or child_stream.has_selected_descendents:
+                child_stream.sync(context=child_context)
+        # only marked complete once the pipeline has written the game
+        self._in_flight.append(self._current_game)
+
+    def _sync_children(self, child_context: dict) -> None:
+        """Sync a game's children, deferring them once the time budget is spent.
+
+        With `skip_completed_games`, final games synced by an earlier run are
+        not synced again.
+        """
+        game_id = child_context["gameId"]
+        if self.config.get("skip_completed_games") and game_id in self._completed_games:
+            return
+        if self._tap.game_time_budget.exhausted:
+            self.deferred_games.add(game_id)
+        else:
+            self._sync_game(child_context)
+            self.deferred_games.discard(game_id)
 
 
 class LivePlaysStream(nhlStream):
+    """Plays of a game's live feed."""
+
     ignore_parent_replication_keys = True
     name = "live_plays"
     parent_stream_type = ScheduleStream
+    state_partitioning_keys: List[str] = []
+    record_context_keys = ["gameId"]
     path = "/game/{gameId}/feed/live"
     primary_keys = ["gameId"]
     records_jsonpath = "$.liveData.plays.allPlays[*]"
-    schema = LivePlaysObject.schema
+    shared_response = True
+    schema = LazySchema("live_plays", "LivePlaysObject")
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Initialize the stream and its configured play filters."""
+        super().__init__(*args, **kwargs)
+        self.event_types = {
+            event_type.upper()
+            for event_type in self.config.get("live_plays_event_types") or []
+        }
+        self.periods = {
+            int(period) for period in self.config.get("live_plays_periods") or []
+        }
+
+    def pipeline_options(self) -> dict:
+        """Return the play filters, for records built in pipeline workers."""
+        return {
+            "event_types": sorted(self.event_types),
+            "periods": sorted(self.periods),
+            "normalize_play_coordinates": bool(
+                self.config.get("normalize_play_coordinates")
+            ),
+        }
+
+    def parse_response(self, response: requests.Response) -> Iterable[dict]:
+        """Parse a game's plays, dropping filtered plays before post-processing."""
+        yield from extract_plays(
+            response.json(),
+            self.event_types,
+            self.periods,
+            bool(self.config.get("normalize_play_coordinates")),
+        )
+
+
+class LivePlaysOnIceStream(nhlStream):
+    """Live feed plays annotated with the home and away skaters on ice."""
+
+    ignore_parent_replication_keys = True
+    name = "live_plays_on_ice"
+    parent_stream_type = ScheduleStream
+    state_partitioning_keys: List[str] = []
+    path = "/game/{gameId}/feed/live"
+    primary_keys = ["gameId", "eventIdx"]
+    replication_key = None
+    shared_response = True
+    schema = LazySchema("live_plays_on_ice", "LivePlaysOnIceObject")
+
+    def game_requests(self, context: dict) -> Dict[str, requests.PreparedRequest]:
+        """Return the live feed and shift chart requests of a game."""
+        shifts_url_base = (
+            self.config.get(ShiftsStream.url_base_setting)
+            or ShiftsStream.default_url_base
+        )
+        shifts_url = compile_url_template(
+            "".join([shifts_url_base, ShiftsStream.path])
+        ).render(context, self._url_encode)
+        shifts_request = self.requests_session.prepare_request(
+            requests.Request("GET", shifts_url, headers=self.http_headers)
+        )
+        return {
+            **super().game_requests(context),
+            "shiftcharts": shifts_request,
+        }
+
+    def request_records(self, context: Optional[dict]) -> Iterable[dict]:
+        """Fetch a game's live feed and shift chart, then join them in memory."""
+        context = context or {}
+        decorated_request = self.request_decorator(self._request)
+        game_requests = self.game_requests(context)
+        feed = decorated_request(game_requests["game_feed"], context).json()
+        shifts = extract_jsonpath(
+            "$.data[*]",
+            input=decorated_request(game_requests["shiftcharts"], context).json(),
+        )
+        # transforms pulls in pandas, so it is only imported when needed
+        from tap_nhl.transforms import annotate_on_ice
+
+        yield from annotate_on_ice(context["gameId"], feed, shifts)
+
+
+class LiveTeamStatsStream(nhlStream):
+    """Per-game, per-team shot attempt aggregates derived from the live feed."""
+
+    ignore_parent_replication_keys = True
+    name = "live_team_stats"
+    parent_stream_type = ScheduleStream
+    state_partitioning_keys: List[str] = []
+    path = "/game/{gameId}/feed/live"
+    primary_keys = ["gameId", "teamId"]
+    replication_key = None
+    shared_response = True
+    schema = LazySchema("live_team_stats", "LiveTeamStatsObject")
+
+    def parse_response(self, response: requests.Response) -> Iterable[dict]:
+        """Compute the team rows of one game in a single batched pass."""
+        from tap_nhl.transforms import team_game_stats
+
+        feed = response.json()
+        yield from team_game_stats(feed["gamePk"], feed)
 
 
 class LiveBoxscoreStream(nhlStream):
+    """Boxscore of a game's live feed, with players as lists."""
+
     ignore_parent_replication_keys = True
     name = "live_boxscore"
     parent_stream_type = ScheduleStream
+    state_partitioning_keys: List[str] = []
+    record_context_keys = ["gameId"]
     path = "/game/{gameId}/feed/live"
     primary_keys = ["gameId"]
     records_jsonpath = "$.liveData.boxscore"
     replication_key = "gameId"
-    schema = LiveBoxscoreObject.schema
-
-    def post_process(self, row: dict, context: Optional[dict] = None) -> Optional[dict]:
-        for team_type in ["away", "home"]:
-            player_data = []
-            if row["teams"].get(team_type):
-                if row["teams"][team_type].get("players"):
-                    player_ids = row["teams"][team_type]["players"].keys()
-                    for player_id in player_ids:
-                        # player stats
-                        if row["teams"][team_type]["players"][player_id].get("stats"):
-                            player_stats_key = list(row["teams"][team_type]["players"][player_id]["stats"])
-                            row["teams"][team_type]["players"][player_id]["stats"]["playerStats"] = row["teams"][team_type]["players"][player_id]["stats"][player_stats_key[0]]
-                            row["teams"][team_type]["players"][player_id]["stats"].pop(player_stats_key[0])
-                        player_data.append(row["teams"][team_type]["players"][player_id]) # append the nested player_ids into a list
-            row["teams"][team_type]["players"] = player_data # assign back to players
-        return row
+    shared_response = True
+    schema = LazySchema("live_boxscore", "LiveBoxscoreObject")
+
+    def post_process(self, row: dict, context: Optional[dict] = None) -> dict:
+        """Turn the per-team players objects into lists."""
+        return flatten_boxscore_players(row)
 
 
 class LiveLinescoreStream(nhlStream):
+    """Linescore of a game's live feed."""
+
     ignore_parent_replication_keys = True
     name = "live_linescore"
     parent_stream_type = ScheduleStream
+    state_partitioning_keys: List[str] = []
+    record_context_keys = ["gameId"]
     path = "/game/{gameId}/feed/live"
     primary_keys = ["gameId"]
     records_jsonpath = "$.liveData.linescore"
     replication_key = "gameId"
-    schema = LiveLinescoreObject.schema
+    shared_response = True
+    schema = LazySchema("live_linescore", "LiveLinescoreObject")
 
 
 class TeamsStream(nhlStream):
+    """Teams and their rosters for each season."""
+
     name = "teams"
     parent_stream_type = SeasonsStream
     path = "/teams"
     primary_keys = ["id"]
     records_jsonpath = "$.teams[*]"
     replication_key = "id"
-    schema = TeamsObject.schema
+    schema = LazySchema("teams", "TeamsObject")
+    reference_ttl = DAY_SECONDS
+
+    def get_reference_immutable_after(self, context: Optional[dict]) -> Optional[float]:
+        """Treat rosters fetched after their season closed as never changing."""
+        context = context or {}
+        return season_closed_at(context["seasonId"]).timestamp()
 
     def get_url_params(
         self, context: Optional[dict], next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
         """Return a dictionary of values to be used in URL parameterization."""
+        context = context or {}
         params = super().get_url_params(context, next_page_token)
-        params.update(
-            {
-                "expand": "team.roster",
-                "season": context["seasonId"]
-            }
-        )
+        params.update({"expand": "team.roster", "season": context["seasonId"]})
         return params
 
     def get_child_context(self, record: dict, context: Optional[dict]) -> dict:
         """Return a context dictionary for child streams."""
+        context = context or {}
         return {
             "roster": record["roster"]["roster"],
             "seasonId": context["seasonId"],
-            "teamId": record["id"]
+            "teamId": record["id"],
         }
 
 
 class DivisionsStream(nhlStream):
+    """NHL divisions."""
+
     name = "divisions"
     path = "/divisions"
     primary_keys = ["id"]
     records_jsonpath = "$.divisions[*]"
     replication_key = None
-    schema = DivisionsObject.schema
+    schema = LazySchema("divisions", "DivisionsObject")
+    reference_ttl = 7 * DAY_SECONDS
 
 
 class DraftStream(nhlStream):
+    """Draft picks of each season's draft."""
+
     name = "draft"
     parent_stream_type = SeasonsStream
-    path = "/draft"
-    primary_keys = ["year", "$.prospect.id"]
+    path = "/draft/{draftYear}"
+    primary_keys = ["year", "pickOverall"]
     records_jsonpath = "$.drafts[*].rounds[*].picks[*]"
     replication_key = "year"
-    schema = DraftObject.schema
-
-    def get_url(self, context: Optional[dict]) -> str:
-        url = "".join([self.url_base, self.path or ""])
-        vals = copy.copy(dict(self.config))
-        vals.update(context or {})
-        for k, v in vals.items():
-            search_text = "".join(["{", k, "}"])
-            if search_text in url:
-                url = url.replace(search_text, self._url_encode(v))
-        url = url + f"/{context['seasonId'][0:4]}"
-        return url
+    schema = LazySchema("draft", "DraftObject")
+
+    def get_url_values(self, context: Optional[dict]) -> Mapping[str, Any]:
+        """Draft URLs are keyed by the first year of the season."""
+        values = super().get_url_values(context)
+        return ChainMap({"draftYear": values["seasonId"][0:4]}, values)
 
     def get_child_context(self, record: dict, context: Optional[dict]) -> dict:
         """Return a context dictionary for child streams."""
-        return {
-            "prospectId": record["prospect"].get("id", "-1") # sometimes the prospect is missing and the fullName is "Void". In that case we pass a dummy prospect ID that doesnt have a corresponding resource.
-        }
+        # sometimes the prospect is missing and the fullName is "Void". In that
+        # case we pass a dummy prospect ID that doesnt have a corresponding resource.
+        return {"prospectId": record["prospect"].get("id", "-1")}
 
 
 class DraftProspectsStream(nhlStream):
+    """Prospects of the draft picks."""
+
     name = "draft_prospects"
     parent_stream_type = DraftStream
+    state_partitioning_keys: List[str] = []
     path = "/draft/prospects/{prospectId}"
     primary_keys = ["id"]
     records_jsonpath = "$.prospects[*]"
-    schema = DraftProspectsObject.schema
-
-    def get_url(self, context: Optional[dict]) -> int:
-        url = "".join([self.url_base, self.path or ""])
-        vals = copy.copy(dict(self.config))
-        vals.update(context or {})
-        for k, v in vals.items():
-            search_text = "".join(["{", k, "}"])
-            if search_text in url:
-                url = url.replace(search_text, self._url_encode(v))
-        return url
+    schema = LazySchema("draft_prospects", "DraftProspectsObject")
 
 
 class PeopleStream(nhlStream):
+    """Players on each season's team rosters."""
+
     name = "people"
     parent_stream_type = TeamsStream
-    path = "/people"
+    # roster-laden contexts would otherwise each add a state partition
+    state_partitioning_keys: List[str] = []
+    record_context_keys = ["seasonId", "teamId"]
+    path = "/people/{current_person_id}"
     primary_keys = ["id"]
     records_jsonpath = "$.people[*]"
     replication_key = None
-    schema = PeopleObject.schema
-
-    def get_url(self, context: Optional[dict]) -> int:
-        url = "".join([self.url_base, self.path or ""])
-        vals = copy.copy(dict(self.config))
-        vals.update(context or {})
-        for k, v in vals.items():
-            search_text = "".join(["{", k, "}"])
-            if search_text in url:
-                url = url.replace(search_text, self._url_encode(v))
-        url = url + f"/{context['current_person_id']}"
-        return url
+    schema = LazySchema("people", "PeopleObject")
 
     def request_records(self, context: Optional[dict]) -> Iterable[dict]:
+        """Request each player of the team's roster."""
         context = context if context else {}
         decorated_request = self.request_decorator(self._request)
         for people in context["roster"]:
@@ -268,21 +463,26 @@ class PeopleStream(nhlStream):
 
 
 class ShiftsStream(nhlStream):
+    """Player shifts of a game from the shift charts API."""
+
+    default_url_base = SHIFTS_URL_BASE
+    url_base_setting = "shifts_api_url"
     name = "shifts"
+    shared_response = True
     parent_stream_type = ScheduleStream
+    state_partitioning_keys: List[str] = []
     path = "/shiftcharts?cayenneExp=gameId={gameId}"
     primary_keys = ["id"]
     records_jsonpath = "$.data[*]"
     replication_key = None
-    schema = ShiftsObject.schema
-
-    def get_url(self, context: Optional[dict]) -> str:
-        url_base = "https://api.nhle.com/stats/rest/en"
-        url = "".join([url_base, self.path or ""])
-        vals = copy.copy(dict(self.config))
-        vals.update(context or {})
-        for k, v in vals.items():
-            search_text = "".join(["{", k, "}"])
-            if search_text in url:
-                url = url.replace(search_text, self._url_encode(v))
-        return url
+    schema = LazySchema("shifts", "ShiftsObject")
+
+    def parse_response(self, response: requests.Response) -> Iterable[dict]:
+        """Parse a game's shifts, normalizing them as one batch if enabled."""
+        yield from extract_shifts(
+            response.json(), bool(self.config.get("normalize_shifts"))
+        )
+
+    def pipeline_options(self) -> dict:
+        """Return the shift options, for records built in pipeline workers."""
+        return {"normalize_shifts": bool(self.config.get("normalize_shifts"))}
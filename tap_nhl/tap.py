@@ -1,24 +1,42 @@
 """nhl tap class."""
 
-from typing import List
+import datetime
+import hashlib
+import json
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Type
 
-from singer_sdk import Tap, Stream
+from singer_sdk import Stream, Tap
 from singer_sdk import typing as th  # JSON schema typing helpers
+from singer_sdk.helpers._singer import Catalog
+
+from tap_nhl.archive import GameArchive
+from tap_nhl.change_detection import RecordHashIndex
+from tap_nhl.client import get_cache_dir
+from tap_nhl.export import ParquetExporter, season_from_game_id
+from tap_nhl.pipeline import EXTRACTORS, GamePipeline
+from tap_nhl.planner import GAME_ENDPOINTS, RequestPlanner, season_ids
+from tap_nhl.profiling import SyncProfiler
+from tap_nhl.reference_cache import ReferenceCache
+from tap_nhl.scheduling import TimeBudget
 
 # import stream types
 from tap_nhl.streams import (
     ConferencesStream,
-    SeasonsStream,
-    ScheduleStream,
-    LivePlaysStream,
-    LiveLinescoreStream,
-    LiveBoxscoreStream,
-    TeamsStream,
-    PeopleStream,
     DivisionsStream,
-    DraftStream,
     DraftProspectsStream,
-    ShiftsStream
+    DraftStream,
+    LiveBoxscoreStream,
+    LiveLinescoreStream,
+    LivePlaysOnIceStream,
+    LivePlaysStream,
+    LiveTeamStatsStream,
+    PeopleStream,
+    ScheduleStream,
+    SeasonsStream,
+    ShiftsStream,
+    TeamsStream,
 )
 
 STREAM_TYPES = [
@@ -26,38 +44,500 @@ STREAM_TYPES = [
     ScheduleStream,
     SeasonsStream,
     LivePlaysStream,
+    LivePlaysOnIceStream,
     LiveLinescoreStream,
     LiveBoxscoreStream,
+    LiveTeamStatsStream,
     TeamsStream,
     PeopleStream,
     DivisionsStream,
     DraftStream,
     DraftProspectsStream,
-    ShiftsStream
+    ShiftsStream,
 ]
 
+STREAM_REGISTRY: Dict[str, Type[Stream]] = {
+    stream_class.name: stream_class for stream_class in STREAM_TYPES
+}
+PACKAGE_DIR = Path(__file__).parent
+# per-game streams and the archived response kinds each of them reads
+ARCHIVED_STREAM_KINDS: Dict[str, List[str]] = {}
+for _kind, _stream_names in GAME_ENDPOINTS.items():
+    for _stream_name in _stream_names:
+        ARCHIVED_STREAM_KINDS.setdefault(_stream_name, []).append(_kind)
+
+
+def selected_stream_names(catalog: dict) -> Set[str]:
+    """Return the names of the streams selected in a Singer catalog dict."""
+    selected = set()
+    for entry in catalog.get("streams", []):
+        for metadata in entry.get("metadata", []):
+            if metadata.get("breadcrumb"):
+                continue
+            values = metadata.get("metadata", {})
+            if values.get("selected", values.get("selected-by-default", False)):
+                selected.add(entry["tap_stream_id"])
+    return selected
+
+
+def required_stream_names(selected: Set[str]) -> Set[str]:
+    """Return the selected streams plus the parent streams they depend on."""
+    required = set()
+    for name in selected:
+        stream_class = STREAM_REGISTRY.get(name)
+        while stream_class is not None:
+            required.add(stream_class.name)
+            stream_class = stream_class.parent_stream_type
+    return required
+
 
 class Tapnhl(Tap):
     """nhl tap class."""
+
     name = "tap-nhl"
+    # monotonic time of the last STATE message, shared by all streams
+    _state_message_written_at: Optional[float] = None
 
     # TODO: Update this section with the actual config values you expect:
     config_jsonschema = th.PropertiesList(
         th.Property(
             "start_date",
             th.DateTimeType,
-            description="The earliest record date to sync"
+            description="The earliest record date to sync",
         ),
         th.Property(
             "api_url",
             th.StringType,
-            default="https://api.mysample.com",
-            description="The url for the API service"
+            default="https://statsapi.web.nhl.com/api/v1",
+            description="The url for the API service",
+        ),
+        th.Property(
+            "shifts_api_url",
+            th.StringType,
+            default="https://api.nhle.com/stats/rest/en",
+            description="The url for the shift charts API service",
+        ),
+        th.Property(
+            "cache_dir",
+            th.StringType,
+            description="Local directory for tap caches (defaults to ~/.cache/tap-nhl)",
+        ),
+        th.Property(
+            "validate_records",
+            th.BooleanType,
+            default=False,
+            description="Validate and coerce records with compiled schema validators",
+        ),
+        th.Property(
+            "validation_sample_rate",
+            th.NumberType,
+            default=1.0,
+            description="Fraction of records to validate when validate_records is on",
+        ),
+        th.Property(
+            "export_format",
+            th.StringType,
+            description="Set to 'parquet' to write records as Parquet files "
+            "partitioned by season and game instead of RECORD messages",
+        ),
+        th.Property(
+            "export_dir",
+            th.StringType,
+            default="output/parquet",
+            description="Root directory for columnar export files",
+        ),
+        th.Property(
+            "normalize_shifts",
+            th.BooleanType,
+            default=False,
+            description="Add parsed clock times and per-player TOI to shift records",
+        ),
+        th.Property(
+            "cache_catalog",
+            th.BooleanType,
+            default=True,
+            description="Reuse a cached discovery catalog while code and config "
+            "are unchanged",
+        ),
+        th.Property(
+            "cache_reference_data",
+            th.BooleanType,
+            default=False,
+            description="Serve conferences, divisions, seasons and teams responses "
+            "from a local cache while they are fresh",
+        ),
+        th.Property(
+            "reference_cache_ttls",
+            th.ObjectType(),
+            description='Per-stream cache TTLs in seconds, e.g. {"teams": 3600}',
+        ),
+        th.Property(
+            "dry_run",
+            th.BooleanType,
+            default=False,
+            description="Only plan the sync: count requests, bytes and wall time "
+            "using cheap parent endpoints, without emitting records",
+        ),
+        th.Property(
+            "plan_concurrency",
+            th.IntegerType,
+            default=1,
+            description="Concurrency assumed by the dry-run wall time estimate",
+        ),
+        th.Property(
+            "plan_output_path",
+            th.StringType,
+            default="output/request_plan.json",
+            description="Where the dry-run request plan is written",
+        ),
+        th.Property(
+            "live_plays_event_types",
+            th.ArrayType(th.StringType),
+            description="Only emit live plays with these result.eventTypeId values, "
+            'e.g. ["SHOT", "GOAL", "PENALTY"]',
+        ),
+        th.Property(
+            "live_plays_periods",
+            th.ArrayType(th.IntegerType),
+            description="Only emit live plays from these periods",
+        ),
+        th.Property(
+            "normalize_play_coordinates",
+            th.BooleanType,
+            default=False,
+            description="Add attack-normalized coordinates, shot distance and "
+            "angle to live plays",
+        ),
+        th.Property(
+            "suppress_unchanged_streams",
+            th.ArrayType(th.StringType),
+            description="Streams whose records are skipped when identical to the "
+            'version emitted by an earlier run, e.g. ["people", "teams"]',
+        ),
+        th.Property(
+            "emit_tombstones",
+            th.BooleanType,
+            default=False,
+            description="Emit records with _sdc_deleted_at for primary keys of "
+            "suppress_unchanged_streams that no longer appear",
+        ),
+        th.Property(
+            "profile",
+            th.BooleanType,
+            default=False,
+            description="Profile each stream's sync and write pstats, collapsed "
+            "stack and memory reports to profile_dir",
+        ),
+        th.Property(
+            "profile_dir",
+            th.StringType,
+            default="output/profile",
+            description="Directory for per-stream profile artifacts",
+        ),
+        th.Property(
+            "profile_memory",
+            th.BooleanType,
+            default=True,
+            description="Trace allocations with tracemalloc while profiling",
+        ),
+        th.Property(
+            "prioritize_recent_games",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Sync seasons newest first and each season's games live, recently "
+                "final, previously deferred, then historical"
+            ),
+        ),
+        th.Property(
+            "recent_game_days",
+            th.NumberType,
+            default=3,
+            description="Age in days up to which a final game counts as recent",
+        ),
+        th.Property(
+            "game_time_budget",
+            th.NumberType,
+            description=(
+                "Seconds of sync time after which the child streams of remaining "
+                "games are deferred to the next run through the state"
+            ),
+        ),
+        th.Property(
+            "archive_raw_responses",
+            th.BooleanType,
+            default=False,
+            description="Archive raw game feed and shift chart responses locally",
+        ),
+        th.Property(
+            "archive_dir",
+            th.StringType,
+            description=(
+                "Directory of the raw response archive, defaults to cache_dir/archive"
+            ),
+        ),
+        th.Property(
+            "reprocess_from_archive",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Rebuild the selected game streams from the archive without network I/O"
+            ),
+        ),
+        th.Property(
+            "reprocess_shard_count",
+            th.IntegerType,
+            default=1,
+            description="Number of parallel tap processes sharing a reprocess run",
+        ),
+        th.Property(
+            "reprocess_shard_index",
+            th.IntegerType,
+            default=0,
+            description="Zero-based shard of archived games handled by this process",
+        ),
+        th.Property(
+            "pipeline_workers",
+            th.IntegerType,
+            default=0,
+            description=(
+                "Worker processes decoding and post-processing per-game responses; "
+                "0 disables the pipeline"
+            ),
+        ),
+        th.Property(
+            "pipeline_fetch_workers",
+            th.IntegerType,
+            default=8,
+            description="Threads fetching per-game responses for the pipeline",
+        ),
+        th.Property(
+            "skip_completed_games",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Skip the child streams of final games completed by an earlier run"
+            ),
+        ),
+        th.Property(
+            "state_message_interval",
+            th.NumberType,
+            default=10,
+            description="Minimum seconds between emitted STATE messages",
         ),
         th.Property("stream_maps", th.ObjectType()),
-        th.Property("stream_map_config", th.ObjectType())
+        th.Property("stream_map_config", th.ObjectType()),
     ).to_dict()
 
     def discover_streams(self) -> List[Stream]:
-        """Return a list of discovered streams."""
-        return [stream_class(tap=self) for stream_class in STREAM_TYPES]
+        """Return a list of discovered streams.
+
+        When an input catalog is given, only the selected streams and their
+        parents are instantiated.
+        """
+        stream_types = STREAM_TYPES
+        if self.input_catalog:
+            required = required_stream_names(
+                selected_stream_names(self.input_catalog.to_dict())
+            )
+            stream_types = [s for s in STREAM_TYPES if s.name in required]
+        return [stream_class(tap=self) for stream_class in stream_types]
+
+    def _catalog_cache_file(self) -> Path:
+        """Return the cached catalog path for the current code and config."""
+        config_text = json.dumps(dict(self.config), sort_keys=True, default=str)
+        fingerprint = hashlib.sha1(config_text.encode())
+        for path in sorted(PACKAGE_DIR.glob("**/*.py")):
+            stat = path.stat()
+            fingerprint.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+        return (
+            get_cache_dir(self.config) / "catalog" / f"{fingerprint.hexdigest()}.json"
+        )
+
+    @property
+    def _singer_catalog(self) -> Catalog:
+        """Return the discovered catalog, reusing a pre-serialized copy if cached."""
+        if not self.config.get("cache_catalog", True):
+            return super()._singer_catalog
+        cache_file = self._catalog_cache_file()
+        if cache_file.exists():
+            return Catalog.from_dict(json.loads(cache_file.read_text()))
+        catalog = super()._singer_catalog
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(catalog.to_dict()))
+        tmp_file.replace(cache_file)
+        return catalog
+
+    @cached_property
+    def exporter(self) -> Optional[ParquetExporter]:
+        """Return the columnar exporter when an export format is configured."""
+        export_format = self.config.get("export_format")
+        if not export_format:
+            return None
+        if export_format != "parquet":
+            raise ValueError(f"Unsupported export_format: {export_format}")
+        return ParquetExporter(Path(self.config.get("export_dir", "output/parquet")))
+
+    @cached_property
+    def reference_cache(self) -> ReferenceCache:
+        """Return the local store for memoized reference-data responses."""
+        return ReferenceCache(get_cache_dir(self.config) / "reference.sqlite")
+
+    def plan_requests(self) -> dict:
+        """Estimate the requests a sync would make, writing the plan to disk."""
+        plan = RequestPlanner(self.streams, dict(self.config)).plan()
+        for name, counts in plan["endpoints"].items():
+            self.logger.info(
+                f"Planned {counts['requests']} requests ({counts['bytes']} bytes) "
+                f"to endpoint '{name}'"
+            )
+        self.logger.info(
+            f"Planned {plan['total_requests']} requests ({plan['total_bytes']} bytes), "
+            f"about {plan['estimated_seconds']}s at concurrency {plan['concurrency']}"
+        )
+        output_path = Path(
+            self.config.get("plan_output_path", "output/request_plan.json")
+        )
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(plan, indent=2))
+        return plan
+
+    @cached_property
+    def profiler(self) -> Optional[SyncProfiler]:
+        """Return the per-stream sync profiler when profiling is enabled."""
+        if not self.config.get("profile"):
+            return None
+        return SyncProfiler(
+            Path(self.config.get("profile_dir", "output/profile")),
+            trace_memory=self.config.get("profile_memory", True),
+            logger=self.logger,
+        )
+
+    @cached_property
+    def archive(self) -> Optional[GameArchive]:
+        """Return the raw response archive when archiving or reprocessing."""
+        if not (
+            self.config.get("archive_raw_responses")
+            or self.config.get("reprocess_from_archive")
+        ):
+            return None
+        archive_dir = self.config.get("archive_dir")
+        if archive_dir:
+            return GameArchive(Path(archive_dir).expanduser())
+        return GameArchive(get_cache_dir(self.config) / "archive")
+
+    def reprocess_archive(self) -> None:
+        """Sync the selected per-game streams from archived responses only."""
+        shard_count = max(int(self.config.get("reprocess_shard_count", 1)), 1)
+        shard_index = int(self.config.get("reprocess_shard_index", 0))
+        seasons = set(
+            season_ids(int(self.config["start_year"]), int(self.config["end_year"]))
+        )
+        archive = self.archive
+        if archive is None:
+            return
+        self._reset_state_progress_markers()
+        streams = [
+            self.streams[name]
+            for name in ARCHIVED_STREAM_KINDS
+            if name in self.streams and self.streams[name].selected
+        ]
+        # game ID -> the streams with every archived response they read
+        game_streams: Dict[int, List[Stream]] = {}
+        for stream in streams:
+            for game_id in archive.game_ids(ARCHIVED_STREAM_KINDS[stream.name]):
+                if (
+                    season_from_game_id(game_id) in seasons
+                    and game_id % shard_count == shard_index
+                ):
+                    game_streams.setdefault(game_id, []).append(stream)
+        self.logger.info(
+            f"Reprocessing {len(game_streams)} archived games into streams "
+            f"{', '.join(stream.name for stream in streams)}"
+        )
+        # each game's streams are synced together, so that a response read from
+        # the archive is shared by all of them
+        for game_id in sorted(game_streams):
+            for stream in game_streams[game_id]:
+                stream.sync(context={"gameId": game_id})
+        for stream in streams:
+            stream.finalize_state_progress_markers()
+            stream._write_state_message(force=True)
+
+    @cached_property
+    def game_pipeline(self) -> Optional[GamePipeline]:
+        """Return the process pool pipeline for per-game streams, if enabled."""
+        workers = int(self.config.get("pipeline_workers") or 0)
+        streams = [
+            stream
+            for name, stream in self.streams.items()
+            if name in EXTRACTORS and stream.selected
+        ]
+        if workers <= 0 or not streams:
+            return None
+        return GamePipeline(
+            streams,
+            workers=workers,
+            fetch_workers=max(int(self.config.get("pipeline_fetch_workers", 8)), 1),
+            preserialize=not self.config.get("stream_maps") and self.exporter is None,
+            logger=self.logger,
+        )
+
+    @cached_property
+    def game_time_budget(self) -> TimeBudget:
+        """Return the time budget for game-level child streams."""
+        return TimeBudget(self.config.get("game_time_budget"))
+
+    @cached_property
+    def record_hashes(self) -> RecordHashIndex:
+        """Return the content hash index of records emitted by earlier runs."""
+        return RecordHashIndex(get_cache_dir(self.config) / "record_hashes.sqlite")
+
+    def finalize_change_tracking(self) -> None:
+        """Save record hashes and emit tombstones for records that disappeared."""
+        emit_tombstones = bool(self.config.get("emit_tombstones"))
+        deleted_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        # a stream without any record this run is not treated as fully deleted,
+        # nor is a season it produced no record for
+        for stream_name in self.record_hashes.seen_streams():
+            if emit_tombstones:
+                self.streams[stream_name].write_tombstones(
+                    sorted(self.record_hashes.missing_keys(stream_name)), deleted_at
+                )
+            self.record_hashes.save(stream_name, remove_missing=emit_tombstones)
+
+    def sync_all(self) -> None:
+        """Sync all streams, then flush any pending columnar export files."""
+        if self.config.get("dry_run"):
+            self.plan_requests()
+            return
+        if self.config.get("reprocess_from_archive"):
+            self.reprocess_archive()
+            return
+        self.game_time_budget.start()
+        try:
+            if self.profiler is None:
+                super().sync_all()
+            else:
+                self.profiler.start()
+                try:
+                    super().sync_all()
+                finally:
+                    self.profiler.close()
+        finally:
+            if self.game_pipeline is not None:
+                self.game_pipeline.close()
+        schedule = self.streams.get("schedule")
+        if schedule is not None and schedule.deferred_games:
+            self.logger.info(
+                f"Deferred {len(schedule.deferred_games)} games to the next run"
+            )
+        # rate limiting may have skipped the latest state, so emit it once more
+        final_state_stream = schedule or next(iter(self.streams.values()), None)
+        if final_state_stream is not None:
+            final_state_stream._write_state_message(force=True)
+        if self.config.get("suppress_unchanged_streams"):
+            self.finalize_change_tracking()
+        if self.exporter is not None:
+            self.exporter.flush()
@@ -0,0 +1,406 @@
+"""Local stand-in for the NHL stats and shift chart APIs.
+
+The server answers the endpoints used by the tap with deterministic synthetic
+payloads (or recorded JSON files) and can inject latency, jitter, 429/5xx
+errors and a bandwidth cap, so load and caching behaviour can be tested
+without touching statsapi.web.nhl.com or api.nhle.com.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+STATS_PREFIX = "/api/v1"
+SHIFTS_PREFIX = "/stats/rest/en"
+CHUNK_SIZE = 16 * 1024
+
+
+class SyntheticNHLData:
+    """Deterministic synthetic NHL payloads sized like the real API."""
+
+    def __init__(
+        self,
+        games_per_season: int = 4,
+        plays_per_game: int = 40,
+        shifts_per_game: int = 60,
+        teams: int = 2,
+        roster_size: int = 3,
+        draft_picks: int = 2,
+    ) -> None:
+        """Size the synthetic seasons, games, rosters and drafts."""
+        self.games_per_season = games_per_season
+        self.plays_per_game = plays_per_game
+        self.shifts_per_game = shifts_per_game
+        self.teams = teams
+        self.roster_size = roster_size
+        self.draft_picks = draft_picks
+
+    def game_ids(self, season_id: str) -> List[int]:
+        """Return the regular season game IDs of a season."""
+        return [
+            int(f"{season_id[0:4]}02{number:04d}")
+            for number in range(1, self.games_per_season + 1)
+        ]
+
+    def player_ids(self, team_id: int) -> List[int]:
+        """Return the roster player IDs of a team."""
+        return [8470000 + team_id * 100 + n for n in range(self.roster_size)]
+
+    def conferences(self) -> dict:
+        """Return the conferences response."""
+        return {"conferences": [{"id": 6, "name": "Eastern", "active": True}]}
+
+    def divisions(self) -> dict:
+        """Return the divisions response."""
+        return {"divisions": [{"id": 17, "name": "Atlantic", "active": True}]}
+
+    def season(self, season_id: str) -> dict:
+        """Return the seasons response of one season."""
+        return {"seasons": [{"seasonId": season_id, "numberOfGames": 82}]}
+
+    def schedule(self, season_id: str) -> dict:
+        """Return a season's schedule, one date per game."""
+        games = [
+            {
+                "gamePk": game_id,
+                "season": season_id,
+                "gameType": "R",
+                "gameDate": f"{season_id[0:4]}-10-{10 + index % 20:02d}T23:00:00Z",
+                "status": {"abstractGameState": "Final", "statusCode": "7"},
+                "teams": {
+                    "away": {"team": {"id": 2}, "score": 1},
+                    "home": {"team": {"id": 1}, "score": 2},
+                },
+            }
+            for index, game_id in enumerate(self.game_ids(season_id))
+        ]
+        return {
+            "dates": [
+                {"date": game["gameDate"][0:10], "games": [game]} for game in games
+            ]
+        }
+
+    def teams_with_roster(self, season_id: str) -> dict:
+        """Return a season's teams with their rosters expanded."""
+        teams = []
+        for team_id in range(1, self.teams + 1):
+            roster = [
+                {"person": {"id": player_id, "fullName": f"Player {player_id}"}}
+                for player_id in self.player_ids(team_id)
+            ]
+            teams.append(
+                {"id": team_id, "name": f"Team {team_id}", "roster": {"roster": roster}}
+            )
+        return {"teams": teams}
+
+    def person(self, person_id: int) -> dict:
+        """Return the people response of one player."""
+        return {"people": [{"id": person_id, "fullName": f"Player {person_id}"}]}
+
+    def draft(self, year: int) -> dict:
+        """Return the draft picks of a draft year."""
+        picks = [
+            {
+                "year": year,
+                "round": "1",
+                "pickOverall": n,
+                "prospect": {"id": 90000 + year % 100 * 100 + n},
+            }
+            for n in range(1, self.draft_picks + 1)
+        ]
+        return {"drafts": [{"draftYear": year, "rounds": [{"picks": picks}]}]}
+
+    def prospect(self, prospect_id: int) -> dict:
+        """Return the prospects response of one prospect."""
+        return {
+            "prospects": [{"id": prospect_id, "fullName": f"Prospect {prospect_id}"}]
+        }
+
+    def feed(self, game_id: int) -> dict:
+        """Return a game's live feed with random plays."""
+        rng = random.Random(game_id)
+        event_types = ["FACEOFF", "SHOT", "MISSED_SHOT", "BLOCKED_SHOT", "HIT", "GOAL"]
+        plays = []
+        for index in range(self.plays_per_game):
+            period = 1 + index * 3 // self.plays_per_game
+            seconds = (index * 1200 * 3 // self.plays_per_game) % 1200
+            team_id = 1 + index % 2
+            direction = 1 if (team_id == 1) == (period % 2 == 1) else -1
+            plays.append(
+                {
+                    "result": {"eventTypeId": rng.choice(event_types)},
+                    "about": {
+                        "eventIdx": index,
+                        "eventId": index + 1,
+                        "period": period,
+                        "periodTime": f"{seconds // 60:02d}:{seconds % 60:02d}",
+                        "goals": {"away": 0, "home": 0},
+                    },
+                    "coordinates": {
+                        "x": direction * rng.randint(30, 89),
+                        "y": rng.randint(-40, 40),
+                    },
+                    "team": {"id": team_id, "triCode": f"T{team_id}"},
+                }
+            )
+        players = {
+            side: {
+                f"ID{player_id}": {
+                    "person": {"id": player_id},
+                    "stats": {"skaterStats": {"goals": 0}},
+                }
+                for player_id in self.player_ids(team_id)
+            }
+            for side, team_id in [("home", 1), ("away", 2)]
+        }
+        return {
+            "gamePk": game_id,
+            "gameData": {
+                "teams": {
+                    "home": {"id": 1, "triCode": "T1"},
+                    "away": {"id": 2, "triCode": "T2"},
+                }
+            },
+            "liveData": {
+                "plays": {"allPlays": plays},
+                "linescore": {"currentPeriod": 3},
+                "boxscore": {
+                    "teams": {
+                        side: {"team": {"id": team_id}, "players": players[side]}
+                        for side, team_id in [("home", 1), ("away", 2)]
+                    }
+                },
+            },
+        }
+
+    def shifts(self, game_id: int) -> dict:
+        """Return a game's shift chart."""
+        data = []
+        for index in range(self.shifts_per_game):
+            team_id = 1 + index % 2
+            player_ids = self.player_ids(team_id)
+            start = (index // 2) * 40 % 1200
+            data.append(
+                {
+                    "id": game_id * 1000 + index,
+                    "gameId": game_id,
+                    "teamId": team_id,
+                    "playerId": player_ids[index // 2 % len(player_ids)],
+                    "period": 1 + (index // 2) * 40 // 1200,
+                    "startTime": f"{start // 60:02d}:{start % 60:02d}",
+                    "endTime": f"{(start + 40) // 60:02d}:{(start + 40) % 60:02d}",
+                    "duration": "00:40",
+                    "typeCode": 517,
+                }
+            )
+        return {"data": data, "total": len(data)}
+
+
+class MockNHLAPI:
+    """Threaded HTTP server serving the NHL endpoints used by the tap.
+
+    Use as a context manager; `stats_url` and `shifts_url` are the values for
+    the tap's `api_url` and `shifts_api_url` settings.
+    """
+
+    def __init__(
+        self,
+        data: Optional[SyntheticNHLData] = None,
+        recorded_dir: Optional[Path] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 429,
+        bandwidth: Optional[float] = None,
+        seed: int = 0,
+    ) -> None:
+        """Configure the server; it starts when the context is entered.
+
+        `data` is served unless `recorded_dir` holds a recorded response for the
+        path. Each response is delayed by `latency` plus or minus up to `jitter`
+        seconds and throttled to `bandwidth` bytes per second, and an
+        `error_rate` fraction of requests fails with `error_status`. `seed`
+        makes jitter and errors reproducible.
+        """
+        self.data = data or SyntheticNHLData()
+        self.recorded_dir = recorded_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.bandwidth = bandwidth
+        self.requests: Counter = Counter()
+        self.paths: List[str] = []  # request paths in arrival order
+        self.in_flight = 0
+        self.max_in_flight = 0  # most requests handled at the same time
+        self.errors: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._routes: List[Tuple[re.Pattern, Callable[..., Any]]] = [
+            (
+                re.compile(rf"{STATS_PREFIX}/conferences$"),
+                lambda q: self.data.conferences(),
+            ),
+            (
+                re.compile(rf"{STATS_PREFIX}/divisions$"),
+                lambda q: self.data.divisions(),
+            ),
+            (
+                re.compile(rf"{STATS_PREFIX}/seasons/(\d{{8}})$"),
+                lambda q, season: self.data.season(season),
+            ),
+            (
+                re.compile(rf"{STATS_PREFIX}/schedule$"),
+                lambda q: self.data.schedule(q["season"][0]),
+            ),
+            (
+                re.compile(rf"{STATS_PREFIX}/teams$"),
+                lambda q: self.data.teams_with_roster(q.get("season", ["20212022"])[0]),
+            ),
+            (
+                re.compile(rf"{STATS_PREFIX}/people/(\d+)$"),
+                lambda q, person: self.data.person(int(person)),
+            ),
+            (
+                re.compile(rf"{STATS_PREFIX}/draft/prospects/(-?\d+)$"),
+                lambda q, prospect: self.data.prospect(int(prospect)),
+            ),
+            (
+                re.compile(rf"{STATS_PREFIX}/draft/(\d{{4}})$"),
+                lambda q, year: self.data.draft(int(year)),
+            ),
+            (
+                re.compile(rf"{STATS_PREFIX}/game/(\d+)/feed/live$"),
+                lambda q, game: self.data.feed(int(game)),
+            ),
+            (
+                re.compile(rf"{SHIFTS_PREFIX}/shiftcharts$"),
+                lambda q: self.data.shifts(int(q["cayenneExp"][0].split("=")[1])),
+            ),
+        ]
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Return the root URL of the running server."""
+        host, port = self._server.server_address[0:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats_url(self) -> str:
+        """Return the URL to use as the tap's `api_url`."""
+        return self.base_url + STATS_PREFIX
+
+    @property
+    def shifts_url(self) -> str:
+        """Return the URL to use as the tap's `shifts_api_url`."""
+        return self.base_url + SHIFTS_PREFIX
+
+    def __enter__(self) -> "MockNHLAPI":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def route(self, path: str, query: Dict[str, List[str]]) -> Optional[bytes]:
+        """Return the body for a request path, or None if it is unknown."""
+        if self.recorded_dir is not None:
+            recorded = self.recorded_dir / (path.strip("/").replace("/", "_") + ".json")
+            if recorded.exists():
+                return recorded.read_bytes()
+        for pattern, handler in self._routes:
+            match = pattern.match(path)
+            if match:
+                return json.dumps(handler(query, *match.groups())).encode("utf-8")
+        return None
+
+    def _delay(self) -> float:
+        with self._lock:
+            jitter = (
+                self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0
+            )
+            return max(self.latency + jitter, 0.0)
+
+    def _inject_error(self) -> bool:
+        with self._lock:
+            return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    def _start_request(self, path: str) -> None:
+        with self._lock:
+            self.requests[path] += 1
+            self.paths.append(path)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _end_request(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def _write(self, wfile: Any, chunk: bytes) -> None:
+        wfile.write(chunk)
+        if self.bandwidth:
+            time.sleep(len(chunk) / self.bandwidth)
+
+    def response(self, path: str, query: Dict[str, List[str]]) -> Tuple[int, bytes]:
+        """Return the status and body of a request, injecting errors if enabled."""
+        if self._inject_error():
+            with self._lock:
+                self.errors[path] += 1
+            return self.error_status, b'{"message": "injected error"}'
+        body = self.route(path, query)
+        if body is None:
+            return 404, b'{"message": "not found"}'
+        return 200, body
+
+    def _handler_class(self) -> type:
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                url = urlsplit(self.path)
+                api._start_request(url.path)
+                self._in_flight = True
+                try:
+                    time.sleep(api._delay())
+                    self._send(*api.response(url.path, parse_qs(url.query)))
+                finally:
+                    self._done()
+
+            def _done(self) -> None:
+                # called before the last bytes are sent: a keep-alive client may
+                # send its next request before this handler gets to run again
+                if self._in_flight:
+                    self._in_flight = False
+                    api._end_request()
+
+            def _send(self, status: int, body: bytes) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.end_headers()
+                last = max(len(body) - 1, 0) // CHUNK_SIZE * CHUNK_SIZE
+                for start in range(0, last, CHUNK_SIZE):
+                    api._write(self.wfile, body[start : start + CHUNK_SIZE])
+                self._done()
+                api._write(self.wfile, body[last:])
+
+        return Handler
@@ -0,0 +1,128 @@
+"""Tests for the raw game response archive."""
+
+import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tap_nhl.archive import INDEX_ENTRY, GameArchive, archive_kind
+
+
+def test_archive_round_trip_and_latest_wins(tmp_path):
+    """Bodies read back after reopening, and the latest put of a game wins."""
+    archive = GameArchive(tmp_path)
+    archive.put(2021020001, "game_feed", b'{"gamePk": 1}')
+    archive.put(2021020001, "shiftcharts", b'{"data": []}')
+    archive.put(2021020002, "game_feed", b'{"gamePk": 2}')
+    archive.put(2021020001, "game_feed", b'{"gamePk": 1, "v": 2}')
+    assert archive.get(2021020001, "game_feed") == b'{"gamePk": 1, "v": 2}'
+    assert archive.game_ids() == [2021020001]
+    assert archive.game_ids(["game_feed"]) == [2021020001, 2021020002]
+    assert archive.get(2021020003, "game_feed") is None
+    archive.close()
+
+    reopened = GameArchive(tmp_path)
+    assert reopened.get(2021020001, "shiftcharts") == b'{"data": []}'
+    assert (2021020002, "game_feed") in reopened
+
+
+def test_unchanged_body_is_not_appended(tmp_path):
+    """Putting the body already archived for a game appends nothing."""
+    archive = GameArchive(tmp_path)
+    archive.put(2021020001, "game_feed", b"{}")
+    archive.put(2021020001, "game_feed", b"{}")
+    assert (tmp_path / "responses.idx").stat().st_size == INDEX_ENTRY.size
+
+
+def test_torn_index_entry_is_ignored(tmp_path):
+    """A partial index entry left by a crash is skipped on load."""
+    archive = GameArchive(tmp_path)
+    archive.put(2021020001, "game_feed", b"{}")
+    with open(tmp_path / "responses.idx", "ab") as index_file:
+        index_file.write(b"\x01\x02")
+    assert GameArchive(tmp_path).game_ids(["game_feed"]) == [2021020001]
+
+
+def test_corrupt_body_is_detected(tmp_path):
+    """A body that fails its checksum raises instead of returning garbage."""
+    archive = GameArchive(tmp_path)
+    archive.put(2021020001, "game_feed", b'{"gamePk": 1}')
+    (tmp_path / "responses.dat").write_bytes(b"\x00" * 8 + b"x" * 100)
+    with pytest.raises(ValueError):
+        GameArchive(tmp_path).get(2021020001, "game_feed")
+
+
+def test_archive_kind():
+    """Per-game request URLs map to their archive kind, others to None."""
+    assert archive_kind("https://h/api/v1/game/2021020001/feed/live") == "game_feed"
+    shifts_url = "https://h/stats/rest/en/shiftcharts?cayenneExp=gameId%3D1"
+    assert archive_kind(shifts_url) == "shiftcharts"
+    assert archive_kind("https://h/api/v1/people/8470000") is None
+
+
+def test_concurrent_appends_keep_the_index_consistent(tmp_path):
+    """Appends from several fetch threads never overlap in the data file."""
+    archive = GameArchive(tmp_path)
+    bodies = {2021020000 + n: b'{"gamePk": %d}' % n * (n + 1) for n in range(200)}
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        for game_id, body in bodies.items():
+            executor.submit(archive.put, game_id, "game_feed", body)
+    reopened = GameArchive(tmp_path)
+    for game_id, body in bodies.items():
+        assert reopened.get(game_id, "game_feed") == body
+
+
+def _records(output, stream_names):
+    records = []
+    for line in output.splitlines():
+        if line.startswith("{"):
+            message = json.loads(line)
+            if message["type"] == "RECORD" and message["stream"] in stream_names:
+                records.append(json.dumps([message["stream"], message["record"]]))
+    return sorted(records)
+
+
+def test_reprocess_reads_each_archived_response_once(tmp_path, capsys, monkeypatch):
+    """Reprocessing rebuilds the game streams, sharing each archived response."""
+    pytest.importorskip("singer_sdk")
+    from tap_nhl.tap import ARCHIVED_STREAM_KINDS, Tapnhl
+    from tap_nhl.tests.mock_api import MockNHLAPI, SyntheticNHLData
+
+    config = {
+        "start_year": 2021,
+        "end_year": 2022,
+        "cache_dir": str(tmp_path),
+        "cache_catalog": False,
+    }
+    # more games than the shared responses kept in memory
+    data = SyntheticNHLData(games_per_season=3)
+    with MockNHLAPI(data=data) as api:
+        Tapnhl(
+            config={
+                **config,
+                "api_url": api.stats_url,
+                "shifts_api_url": api.shifts_url,
+                "archive_raw_responses": True,
+            },
+            parse_env_config=False,
+        ).sync_all()
+    synced = _records(capsys.readouterr().out, ARCHIVED_STREAM_KINDS)
+
+    reads = Counter()
+    get = GameArchive.get
+
+    def counting_get(archive, game_id, kind):
+        reads[(game_id, kind)] += 1
+        return get(archive, game_id, kind)
+
+    monkeypatch.setattr(GameArchive, "get", counting_get)
+    Tapnhl(
+        config={**config, "reprocess_from_archive": True}, parse_env_config=False
+    ).sync_all()
+    assert _records(capsys.readouterr().out, ARCHIVED_STREAM_KINDS) == synced
+    game_ids = data.game_ids("20212022")
+    assert set(reads) == {
+        (game_id, kind) for game_id in game_ids for kind in ["game_feed", "shiftcharts"]
+    }
+    assert set(reads.values()) == {1}
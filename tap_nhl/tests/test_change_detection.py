@@ -0,0 +1,115 @@
+"""Tests for the record hash index behind unchanged-record suppression."""
+
+import json
+
+import pytest
+
+from tap_nhl.change_detection import RecordHashIndex, record_digest, record_key
+
+PERSON = {"id": 8478402, "fullName": "Connor McDavid", "seasonId": "20212022"}
+
+
+def _index(tmp_path):
+    return RecordHashIndex(tmp_path / "record_hashes.sqlite")
+
+
+def test_digest_ignores_key_order():
+    """Records with the same content hash alike whatever their key order."""
+    reordered = dict(reversed(list(PERSON.items())))
+    assert record_digest(reordered) == record_digest(PERSON)
+    assert record_digest({**PERSON, "fullName": "C. McDavid"}) != record_digest(PERSON)
+
+
+def test_unchanged_records_are_suppressed_on_the_next_run(tmp_path):
+    """A record emitted by an earlier run is unchanged until its content changes."""
+    key = record_key(PERSON, ["id"])
+    index = _index(tmp_path)
+    assert index.is_changed("people", key, PERSON, "20212022")
+    index.save("people")
+
+    index = _index(tmp_path)
+    assert not index.is_changed("people", key, PERSON, "20212022")
+    assert index.is_changed("people", key, {**PERSON, "fullName": "x"}, "20212022")
+
+
+def test_keys_are_scoped_by_season(tmp_path):
+    """The same primary key synced for two seasons is tracked once per season."""
+    key = record_key(PERSON, ["id"])
+    later = {**PERSON, "seasonId": "20222023"}
+    index = _index(tmp_path)
+    assert index.is_changed("people", key, PERSON, "20212022")
+    assert index.is_changed("people", key, later, "20222023")
+    index.save("people")
+
+    index = _index(tmp_path)
+    assert not index.is_changed("people", key, PERSON, "20212022")
+    assert not index.is_changed("people", key, later, "20222023")
+
+
+def test_duplicate_key_in_one_run_is_compared_with_the_first(tmp_path):
+    """A key emitted twice in a run is only changed if its content differs."""
+    key = record_key(PERSON, ["id"])
+    index = _index(tmp_path)
+    assert index.is_changed("people", key, PERSON, "20212022")
+    assert not index.is_changed("people", key, PERSON, "20212022")
+    assert index.is_changed("people", key, {**PERSON, "fullName": "x"}, "20212022")
+
+
+def test_missing_keys_are_limited_to_synced_seasons(tmp_path):
+    """Only seasons with records in this run can report deleted keys."""
+    other = {**PERSON, "id": 8479318}
+    index = _index(tmp_path)
+    for season in ["20202021", "20212022"]:
+        index.is_changed("people", record_key(PERSON, ["id"]), PERSON, season)
+        index.is_changed("people", record_key(other, ["id"]), other, season)
+    index.save("people")
+
+    index = _index(tmp_path)
+    index.is_changed("people", record_key(PERSON, ["id"]), PERSON, "20212022")
+    assert index.missing_keys("people") == {("20212022", record_key(other, ["id"]))}
+
+    index.save("people", remove_missing=True)
+    index = _index(tmp_path)
+    index.is_changed("people", record_key(PERSON, ["id"]), PERSON, "20212022")
+    assert index.missing_keys("people") == set()
+    # the season outside this run's range is still indexed
+    assert not index.is_changed("people", record_key(other, ["id"]), other, "20202021")
+
+
+def _record_streams(output):
+    streams = []
+    for line in output.splitlines():
+        if line.startswith("{"):
+            message = json.loads(line)
+            if message["type"] == "RECORD":
+                streams.append(message["stream"])
+    return streams
+
+
+def test_suppressed_parents_still_sync_their_children(tmp_path, capsys):
+    """Unchanged seasons and teams are not emitted, but their children are."""
+    pytest.importorskip("singer_sdk")
+    from tap_nhl.tap import Tapnhl
+    from tap_nhl.tests.mock_api import MockNHLAPI, SyntheticNHLData
+
+    runs = []
+    with MockNHLAPI(data=SyntheticNHLData(games_per_season=2)) as api:
+        for _ in range(2):
+            Tapnhl(
+                config={
+                    "start_year": 2021,
+                    "end_year": 2022,
+                    "api_url": api.stats_url,
+                    "shifts_api_url": api.shifts_url,
+                    "cache_dir": str(tmp_path),
+                    "cache_catalog": False,
+                    "suppress_unchanged_streams": ["seasons", "teams"],
+                },
+                parse_env_config=False,
+            ).sync_all()
+            runs.append(_record_streams(capsys.readouterr().out))
+    first, second = runs
+    assert "seasons" in first and "teams" in first
+    assert "seasons" not in second and "teams" not in second
+    for child in ["schedule", "draft", "people", "live_plays"]:
+        assert second.count(child) == first.count(child) > 0
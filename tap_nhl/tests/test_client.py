@@ -0,0 +1,32 @@
+"""Tests for the shared REST client helpers."""
+
+from urllib.parse import quote
+
+import pytest
+
+pytest.importorskip("singer_sdk")
+
+from tap_nhl.client import UrlTemplate, compile_url_template  # noqa: E402
+
+
+def test_url_template_renders_encoded_values():
+    """Fields are substituted through the encoder, literals are kept as is."""
+    template = UrlTemplate("https://host/api/{season}/teams/{team id}?q=1")
+    assert template.fields == ["season", "team id"]
+    values = {"season": 20212022, "team id": "a/b c"}
+    url = template.render(values, lambda value: quote(str(value), safe=""))
+    assert url == "https://host/api/20212022/teams/a%2Fb%20c?q=1"
+
+
+def test_url_template_leaves_unknown_fields():
+    """Fields without a value are rendered back as `{field}`."""
+    template = UrlTemplate("/draft/{draftYear}/{missing}")
+    assert template.render({"draftYear": 2021}, str) == "/draft/2021/{missing}"
+    assert UrlTemplate("/conferences").render({}, str) == "/conferences"
+
+
+def test_compile_url_template_is_cached():
+    """A template string is parsed once and then reused."""
+    assert compile_url_template("/game/{gameId}") is compile_url_template(
+        "/game/{gameId}"
+    )
@@ -15,10 +15,7 @@ SAMPLE_CONFIG = {
 # Run standard built-in tap tests from the SDK:
 def test_standard_tap_tests():
     """Run standard tap tests from the SDK."""
-    tests = get_standard_tap_tests(
-        Tapnhl,
-        config=SAMPLE_CONFIG
-    )
+    tests = get_standard_tap_tests(Tapnhl, config=SAMPLE_CONFIG)
     for test in tests:
         test()
 
@@ -0,0 +1,117 @@
+"""Tests for the columnar Parquet export."""
+
+import json
+
+import pytest
+
+from tap_nhl.export import export_partition, season_from_game_id
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": ["integer", "null"]},
+        "x": {"type": ["number", "null"]},
+        "name": {"type": ["string", "null"]},
+        "about": {
+            "type": ["object", "null"],
+            "properties": {"period": {"type": ["integer", "null"]}},
+        },
+        "extra": {"type": ["object", "null"]},
+        "tags": {"type": ["array", "null"], "items": {"type": ["string"]}},
+    },
+}
+
+
+def test_export_partition():
+    """Contexts map to season and game partitions."""
+    assert export_partition(None) == ()
+    assert export_partition({"seasonId": "20212022"}) == (("season", "20212022"),)
+    assert export_partition({"gameId": 2021020001}) == (
+        ("season", "20212022"),
+        ("game", "2021020001"),
+    )
+    assert season_from_game_id(2015030411) == "20152016"
+
+
+def test_arrow_schema_follows_the_json_schema():
+    """Column types come from the JSON schema, not from the records."""
+    pa = pytest.importorskip("pyarrow")
+    from tap_nhl.export import _load_pyarrow, arrow_schema
+
+    _load_pyarrow()
+    schema = arrow_schema(SCHEMA)
+    assert schema.field("id").type == pa.int64()
+    assert schema.field("x").type == pa.float64()
+    assert schema.field("about").type == pa.struct([pa.field("period", pa.int64())])
+    assert schema.field("extra").type == pa.string()
+    assert schema.field("tags").type == pa.list_(pa.string())
+
+
+def test_parquet_round_trip(tmp_path):
+    """Exported records read back with the schema's types in their partition."""
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    from tap_nhl.export import ParquetExporter
+
+    exporter = ParquetExporter(tmp_path, max_buffered_rows=2)
+    partition = export_partition({"gameId": 2021020001})
+    records = [
+        # a batch of nulls must not narrow the column types
+        {"id": None, "x": None, "name": None},
+        {"id": 2, "x": 3, "name": "b", "about": {"period": 1}, "ignored": True},
+        {"id": 3, "x": 1.5, "extra": {"a": 1}, "tags": ["c", "d"]},
+    ]
+    for record in records:
+        exporter.add("plays", SCHEMA, partition, record)
+    exporter.flush()
+
+    directory = tmp_path / "plays" / "season=20212022" / "game=2021020001"
+    assert len(list(directory.glob("part-*.parquet"))) == 2
+    table = pq.read_table(directory)
+    assert table.schema.names == list(SCHEMA["properties"])
+    rows = sorted(table.to_pylist(), key=lambda row: row["id"] or 0)
+    assert rows[0] == {
+        "id": None,
+        "x": None,
+        "name": None,
+        "about": None,
+        "extra": None,
+        "tags": None,
+    }
+    assert rows[1]["x"] == 3.0
+    assert rows[1]["about"] == {"period": 1}
+    assert json.loads(rows[2]["extra"]) == {"a": 1}
+    assert rows[2]["tags"] == ["c", "d"]
+
+
+def test_tap_export_applies_stream_maps(tmp_path, capsys):
+    """Exported records are conformed and mapped like RECORD messages."""
+    pa = pytest.importorskip("pyarrow")
+    pytest.importorskip("singer_sdk")
+    import pyarrow.parquet as pq
+
+    from tap_nhl.tap import Tapnhl
+    from tap_nhl.tests.mock_api import MockNHLAPI, SyntheticNHLData
+
+    with MockNHLAPI(data=SyntheticNHLData(games_per_season=1)) as api:
+        Tapnhl(
+            config={
+                "start_year": 2021,
+                "end_year": 2022,
+                "api_url": api.stats_url,
+                "shifts_api_url": api.shifts_url,
+                "cache_dir": str(tmp_path / "cache"),
+                "cache_catalog": False,
+                "export_format": "parquet",
+                "export_dir": str(tmp_path / "export"),
+                "stream_maps": {"conferences": {"upperName": "name.upper()"}},
+            },
+            parse_env_config=False,
+        ).sync_all()
+    assert '"type": "RECORD"' not in capsys.readouterr().out
+    table = pq.read_table(tmp_path / "export" / "conferences")
+    assert table.schema.field("upperName").type == pa.string()
+    row = table.to_pylist()[0]
+    assert row["id"] == 6
+    assert row["upperName"] == row["name"].upper()
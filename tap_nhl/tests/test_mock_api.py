@@ -0,0 +1,174 @@
+"""Load, fault injection and scaling tests against the local mock NHL API."""
+
+import json
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from tap_nhl.tests.mock_api import MockNHLAPI, SyntheticNHLData
+
+GAME_IDS = SyntheticNHLData(games_per_season=16).game_ids("20212022")
+
+
+def _fetch_feeds(api: MockNHLAPI, concurrency: int) -> None:
+    """Fetch every game feed with `concurrency` workers."""
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=concurrency))
+    urls = [f"{api.stats_url}/game/{game_id}/feed/live" for game_id in GAME_IDS]
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        statuses = list(executor.map(lambda url: session.get(url).status_code, urls))
+    assert statuses == [200] * len(urls)
+
+
+@pytest.mark.parametrize("concurrency", [1, 4, 8])
+def test_server_handles_concurrent_requests(concurrency):
+    """Requests of concurrent clients overlap on the server, up to the worker count."""
+    with MockNHLAPI(latency=0.05) as api:
+        _fetch_feeds(api, concurrency)
+    assert sum(api.requests.values()) == len(GAME_IDS)
+    assert api.in_flight == 0
+    if concurrency == 1:
+        assert api.max_in_flight == 1
+    else:
+        assert 1 < api.max_in_flight <= concurrency
+
+
+def test_bandwidth_cap_limits_large_responses():
+    """A response is not delivered faster than the bandwidth cap allows."""
+    data = SyntheticNHLData(plays_per_game=2000)
+    with MockNHLAPI(data=data, bandwidth=2_000_000) as api:
+        started = time.perf_counter()
+        response = requests.get(f"{api.stats_url}/game/{GAME_IDS[0]}/feed/live")
+        elapsed = time.perf_counter() - started
+    assert response.status_code == 200
+    # the server sleeps per chunk, so this is a lower bound and cannot flake
+    assert elapsed >= 0.8 * len(response.content) / 2_000_000
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_error_injection(status):
+    """Injected errors are served with the configured status and counted."""
+    with MockNHLAPI(error_rate=0.5, error_status=status, seed=1) as api:
+        url = f"{api.shifts_url}/shiftcharts?cayenneExp=gameId={GAME_IDS[0]}"
+        statuses = [requests.get(url).status_code for _ in range(40)]
+    assert set(statuses) == {200, status}
+    assert statuses.count(status) == api.errors["/stats/rest/en/shiftcharts"]
+
+
+def test_recorded_responses_override_synthetic_data(tmp_path):
+    """Recorded files take precedence; unknown paths are a 404."""
+    (tmp_path / "api_v1_conferences.json").write_text('{"conferences": []}')
+    with MockNHLAPI(recorded_dir=tmp_path) as api:
+        conferences = requests.get(f"{api.stats_url}/conferences").json()
+        assert conferences == {"conferences": []}
+        assert requests.get(f"{api.stats_url}/divisions").json()["divisions"]
+        assert requests.get(f"{api.stats_url}/unknown").status_code == 404
+
+
+def test_tap_sync_shares_one_feed_request_per_game(tmp_path, capsys):
+    """All live_* streams of a game share a single feed request."""
+    pytest.importorskip("singer_sdk")
+    from tap_nhl.tap import Tapnhl
+
+    data = SyntheticNHLData(games_per_season=3)
+    with MockNHLAPI(data=data) as api:
+        tap = Tapnhl(
+            config={
+                "start_year": 2021,
+                "end_year": 2022,
+                "api_url": api.stats_url,
+                "shifts_api_url": api.shifts_url,
+                "cache_dir": str(tmp_path),
+                "cache_catalog": False,
+            },
+            parse_env_config=False,
+        )
+        tap.sync_all()
+    capsys.readouterr()
+    game_ids = data.game_ids("20212022")
+    for game_id in game_ids:
+        assert api.requests[f"/api/v1/game/{game_id}/feed/live"] == 1
+    assert api.requests["/stats/rest/en/shiftcharts"] == len(game_ids)
+
+
+def _record_counts(output):
+    counts = Counter()
+    for line in output.splitlines():
+        if line.startswith("{"):
+            message = json.loads(line)
+            if message["type"] == "RECORD":
+                counts[message["stream"]] += 1
+    return counts
+
+
+def _sync_tap(api, cache_dir, **config):
+    from tap_nhl.tap import Tapnhl
+
+    Tapnhl(
+        config={
+            "start_year": 2021,
+            "end_year": 2022,
+            "api_url": api.stats_url,
+            "shifts_api_url": api.shifts_url,
+            "cache_dir": str(cache_dir),
+            "cache_catalog": False,
+            **config,
+        },
+        parse_env_config=False,
+    ).sync_all()
+
+
+@pytest.mark.parametrize("fetch_workers", [1, 4, 8])
+def test_tap_pipeline_uses_its_fetch_workers(tmp_path, capsys, fetch_workers):
+    """The game pipeline keeps up to one game request in flight per fetch worker."""
+    pytest.importorskip("singer_sdk")
+
+    data = SyntheticNHLData(games_per_season=8)
+    with MockNHLAPI(data=data, latency=0.05) as api:
+        _sync_tap(
+            api,
+            tmp_path,
+            pipeline_workers=1,
+            pipeline_fetch_workers=fetch_workers,
+        )
+    counts = _record_counts(capsys.readouterr().out)
+    game_ids = data.game_ids("20212022")
+    assert counts["live_plays"] == len(game_ids) * data.plays_per_game
+    assert counts["shifts"] == len(game_ids) * data.shifts_per_game
+    for game_id in game_ids:
+        assert api.requests[f"/api/v1/game/{game_id}/feed/live"] == 1
+    if fetch_workers == 1:
+        assert api.max_in_flight == 1
+    else:
+        assert fetch_workers // 2 < api.max_in_flight <= fetch_workers
+
+
+def _no_wait(*args, **kwargs):
+    while True:
+        yield 0
+
+
+@pytest.mark.parametrize("pipeline_workers", [0, 1])
+@pytest.mark.parametrize("status", [429, 503])
+def test_tap_retries_injected_errors(
+    tmp_path, capsys, monkeypatch, status, pipeline_workers
+):
+    """Requests failing with 429 or 5xx are retried and the output is complete."""
+    pytest.importorskip("singer_sdk")
+    import backoff
+
+    # retry at once instead of after exponentially growing waits
+    monkeypatch.setattr(backoff, "expo", _no_wait)
+    data = SyntheticNHLData(games_per_season=4)
+    config = {"pipeline_workers": pipeline_workers}
+    with MockNHLAPI(data=data) as api:
+        _sync_tap(api, tmp_path / "clean", **config)
+    expected = _record_counts(capsys.readouterr().out)
+
+    with MockNHLAPI(data=data, error_rate=0.1, error_status=status, seed=2) as api:
+        _sync_tap(api, tmp_path / "faulty", **config)
+    assert sum(api.errors.values()) > 0
+    assert _record_counts(capsys.readouterr().out) == expected
@@ -0,0 +1,179 @@
+"""Tests for the per-game record pipeline run in worker processes."""
+
+import json
+
+import pytest
+
+pytest.importorskip("singer_sdk")
+
+from tap_nhl.pipeline import (  # noqa: E402
+    EXTRACTORS,
+    _init_worker,
+    conform_record,
+    flatten_boxscore_players,
+    process_game,
+)
+from tap_nhl.tap import Tapnhl  # noqa: E402
+from tap_nhl.tests.mock_api import MockNHLAPI, SyntheticNHLData  # noqa: E402
+
+
+def _spec(**overrides):
+    spec = {
+        "options": {},
+        "schema": {
+            "type": "object",
+            "properties": {
+                "gameId": {"type": ["integer", "null"]},
+                "result": {"type": ["object", "null"], "properties": {}},
+                "teams": {"type": ["object", "null"]},
+            },
+        },
+        "replication_key": None,
+        "record_context_keys": ["gameId"],
+        "validate": False,
+        "sample_rate": 1.0,
+        "cache_dir": "",
+        "selected_properties": None,
+        "preserialize": False,
+    }
+    spec.update(overrides)
+    return spec
+
+
+def test_flatten_boxscore_players():
+    """Players become lists and their stats move under playerStats."""
+    row = {
+        "teams": {
+            "home": {
+                "players": {
+                    "ID1": {
+                        "person": {"id": 1},
+                        "stats": {"goalieStats": {"saves": 30}},
+                    }
+                }
+            },
+            "away": {"players": {}},
+        }
+    }
+    flattened = flatten_boxscore_players(row)
+    assert flattened["teams"]["home"]["players"] == [
+        {"person": {"id": 1}, "stats": {"playerStats": {"saves": 30}}}
+    ]
+    assert flattened["teams"]["away"]["players"] == []
+
+
+def test_process_game_builds_and_serializes_records():
+    """Records are filtered, conformed and serialized as RECORD messages."""
+    data = SyntheticNHLData()
+    game_id = data.game_ids("20212022")[0]
+    _init_worker(
+        {
+            "live_boxscore": _spec(replication_key="gameId"),
+            "live_plays": _spec(
+                options={
+                    "event_types": ["GOAL"],
+                    "periods": [],
+                    "normalize_play_coordinates": False,
+                },
+                selected_properties={"result", "gameId"},
+                preserialize=True,
+            ),
+        }
+    )
+    bodies = {"game_feed": json.dumps(data.feed(game_id)).encode()}
+    results = dict(
+        (name, (records, bookmark))
+        for name, records, bookmark in process_game(
+            {"gameId": game_id}, bodies, ["live_boxscore", "live_plays"]
+        )
+    )
+    boxscores, bookmark = results["live_boxscore"]
+    assert bookmark == game_id
+    assert isinstance(boxscores[0]["teams"]["home"]["players"], list)
+    lines, _ = results["live_plays"]
+    messages = [json.loads(line) for line in lines.splitlines()]
+    goals = [
+        play
+        for play in data.feed(game_id)["liveData"]["plays"]["allPlays"]
+        if play["result"]["eventTypeId"] == "GOAL"
+    ]
+    assert len(messages) == len(goals)
+    assert all(message["type"] == "RECORD" for message in messages)
+    assert all(set(message["record"]) == {"result", "gameId"} for message in messages)
+    # "result" has no declared sub-properties, so everything inside is dropped
+    assert all(message["record"]["result"] == {} for message in messages)
+
+
+def test_conform_record_drops_undeclared_nested_properties():
+    """Unknown keys are removed at every level, including inside arrays."""
+    schema = {
+        "properties": {
+            "a": {"type": "integer"},
+            "b": {"type": "object", "properties": {"c": {"type": "integer"}}},
+            "d": {"type": "array", "items": {"properties": {"e": {"type": "string"}}}},
+        }
+    }
+    record = {"a": 1, "x": 2, "b": {"c": 3, "y": 4}, "d": [{"e": "f", "z": 5}]}
+    assert conform_record(record, schema) == {"a": 1, "b": {"c": 3}, "d": [{"e": "f"}]}
+
+
+def _sync_records(config, capsys):
+    tap = Tapnhl(config=config, parse_env_config=False)
+    tap.sync_all()
+    records = {}
+    for line in capsys.readouterr().out.splitlines():
+        message = json.loads(line)
+        if message["type"] == "RECORD" and message["stream"] in EXTRACTORS:
+            records.setdefault(message["stream"], []).append(message["record"])
+    return records
+
+
+def test_pipeline_output_matches_normal_sync(tmp_path, capsys):
+    """A pipelined sync writes the same records as a normal one."""
+    with MockNHLAPI(data=SyntheticNHLData(games_per_season=3)) as api:
+        config = {
+            "start_year": 2021,
+            "end_year": 2022,
+            "api_url": api.stats_url,
+            "shifts_api_url": api.shifts_url,
+            "cache_dir": str(tmp_path),
+            "cache_catalog": False,
+        }
+        normal = _sync_records(config, capsys)
+        pipelined = _sync_records({**config, "pipeline_workers": 2}, capsys)
+    assert set(normal) == set(EXTRACTORS)
+    assert pipelined == normal
+
+
+def test_failed_sync_shuts_the_pipeline_down(tmp_path, monkeypatch):
+    """The worker pools are shut down even when the sync raises."""
+    with MockNHLAPI(data=SyntheticNHLData(games_per_season=1)) as api:
+        tap = Tapnhl(
+            config={
+                "start_year": 2021,
+                "end_year": 2022,
+                "api_url": api.stats_url,
+                "shifts_api_url": api.shifts_url,
+                "cache_dir": str(tmp_path),
+                "cache_catalog": False,
+                "pipeline_workers": 1,
+            },
+            parse_env_config=False,
+        )
+
+        def fail(context):
+            raise RuntimeError("sync failed")
+
+        monkeypatch.setattr(tap.streams["seasons"], "get_records", fail)
+        pipeline = tap.game_pipeline
+        close = pipeline.close
+        closed = []
+
+        def recording_close():
+            closed.append(True)
+            close()
+
+        monkeypatch.setattr(pipeline, "close", recording_close)
+        with pytest.raises(RuntimeError, match="sync failed"):
+            tap.sync_all()
+    assert closed == [True]
@@ -0,0 +1,58 @@
+"""Tests for the dry-run request planner."""
+
+import json
+
+import pytest
+
+pytest.importorskip("singer_sdk")
+
+from tap_nhl.planner import season_ids  # noqa: E402
+from tap_nhl.tap import Tapnhl  # noqa: E402
+from tap_nhl.tests.mock_api import MockNHLAPI, SyntheticNHLData  # noqa: E402
+
+
+def test_season_ids():
+    """Seasons run from start_year up to, but not including, end_year."""
+    assert season_ids(2019, 2022) == ["20192020", "20202021", "20212022"]
+    # a range shorter than a season still visits the start year's season
+    assert season_ids(2021, 2021) == ["20212022"]
+
+
+def test_plan_counts_requests_per_endpoint(tmp_path, capsys):
+    """The plan counts one request per parent record, and per game endpoint."""
+    data = SyntheticNHLData(games_per_season=3, teams=2, roster_size=3, draft_picks=2)
+    output_path = tmp_path / "plan.json"
+    with MockNHLAPI(data=data) as api:
+        tap = Tapnhl(
+            config={
+                "start_year": 2020,
+                "end_year": 2022,
+                "api_url": api.stats_url,
+                "shifts_api_url": api.shifts_url,
+                "cache_dir": str(tmp_path),
+                "cache_catalog": False,
+                "dry_run": True,
+                "plan_output_path": str(output_path),
+            },
+            parse_env_config=False,
+        )
+        tap.sync_all()
+    capsys.readouterr()
+    plan = json.loads(output_path.read_text())
+    requests = {name: counts["requests"] for name, counts in plan["endpoints"].items()}
+    assert requests == {
+        "conferences": 1,
+        "divisions": 1,
+        "seasons": 2,
+        "schedule": 2,
+        "teams": 2,
+        "people": 2 * 2 * 3,
+        "draft": 2,
+        "draft_prospects": 2 * 2,
+        "game_feed": 2 * 3,
+        "shiftcharts": 2 * 3,
+    }
+    assert plan["total_requests"] == sum(requests.values())
+    # only the schedule, teams and draft endpoints are fetched while planning
+    assert api.requests["/api/v1/schedule"] == 2
+    assert not any("/feed/live" in path for path in api.requests)
@@ -0,0 +1,59 @@
+"""Tests for the per-stream sync profiler."""
+
+import time
+import tracemalloc
+
+from tap_nhl.profiling import SyncProfiler
+
+
+def _allocate(size):
+    return [bytearray(size) for _ in range(10)]
+
+
+def test_profile_report_structure(tmp_path, monkeypatch):
+    """Each profiled stream gets its pstats, collapsed and memory reports."""
+    snapshots = []
+    take_snapshot = tracemalloc.take_snapshot
+
+    def counting_take_snapshot():
+        snapshots.append(True)
+        return take_snapshot()
+
+    monkeypatch.setattr(tracemalloc, "take_snapshot", counting_take_snapshot)
+    profiler = SyncProfiler(tmp_path, sample_interval=0.001)
+    profiler.start()
+    try:
+        with profiler.profile("schedule"):
+            _allocate(1000)
+            for _ in range(50):
+                with profiler.profile("live_plays"):
+                    _allocate(10_000)
+    finally:
+        profiler.close()
+
+    for stream_name in ["schedule", "live_plays"]:
+        for suffix in ["pstats", "collapsed", "memory.txt"]:
+            assert (tmp_path / f"{stream_name}.{suffix}").exists()
+        memory = (tmp_path / f"{stream_name}.memory.txt").read_text().splitlines()
+        assert memory[0].startswith("peak traced memory: ")
+        assert int(memory[0].split()[3]) > 0
+        assert memory[1].startswith("top 25 allocation sites")
+    # repeated child syncs of a similar size do not retake the snapshot
+    assert len(snapshots) < 10
+
+
+def test_allocation_sites_are_snapshotted_near_the_peak(tmp_path):
+    """Memory freed before the end of a sync still shows in its top sites."""
+    profiler = SyncProfiler(tmp_path, sample_interval=0.001)
+    profiler.start()
+    try:
+        with profiler.profile("live_plays"):
+            buffers = _allocate(1_000_000)
+            time.sleep(0.05)
+            del buffers
+    finally:
+        profiler.close()
+
+    memory = (tmp_path / "live_plays.memory.txt").read_text().splitlines()
+    allocation_line = _allocate.__code__.co_firstlineno + 1
+    assert memory[2].startswith(f"{__file__}:{allocation_line}: ")
@@ -0,0 +1,51 @@
+"""Tests for the reference-data response cache."""
+
+import datetime
+import math
+import time
+
+from tap_nhl.reference_cache import ReferenceCache, season_closed_at
+
+DAY_SECONDS = 24 * 60 * 60
+
+
+def _cache_with_entry(tmp_path, fetched_at):
+    cache = ReferenceCache(tmp_path / "reference.sqlite")
+    cache.put("url", b"body")
+    cache._connection.execute("UPDATE responses SET fetched_at = ?", (fetched_at,))
+    return cache
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    """An entry older than the TTL is a miss, a younger one a hit."""
+    cache = _cache_with_entry(tmp_path, time.time() - 2 * DAY_SECONDS)
+    assert cache.get("url", DAY_SECONDS) is None
+    assert cache.get("url", 3 * DAY_SECONDS) == b"body"
+    assert cache.get("missing", DAY_SECONDS) is None
+
+
+def test_infinite_ttl_never_expires(tmp_path):
+    """An infinite TTL returns entries of any age."""
+    cache = _cache_with_entry(tmp_path, 0.0)
+    assert cache.get("url", math.inf) == b"body"
+
+
+def test_entry_fetched_after_close_is_immutable(tmp_path):
+    """Entries fetched after a season closed are served whatever their age."""
+    closed_at = season_closed_at("20182019").timestamp()
+    cache = _cache_with_entry(tmp_path, closed_at + DAY_SECONDS)
+    assert cache.get("url", DAY_SECONDS, immutable_after=closed_at) == b"body"
+
+
+def test_entry_fetched_before_close_still_expires(tmp_path):
+    """A response cached mid-season is not served forever once it closes."""
+    closed_at = season_closed_at("20182019").timestamp()
+    cache = _cache_with_entry(tmp_path, closed_at - DAY_SECONDS)
+    assert cache.get("url", DAY_SECONDS, immutable_after=closed_at) is None
+
+
+def test_season_closed_at():
+    """A season closes on 1 October of the year it ends."""
+    assert season_closed_at("20192020") == datetime.datetime(
+        2020, 10, 1, tzinfo=datetime.timezone.utc
+    )
@@ -0,0 +1,96 @@
+"""Tests for the deferred and completed games kept in the schedule state."""
+
+import copy
+
+import pytest
+
+pytest.importorskip("singer_sdk")
+
+from tap_nhl.state import decode_ranges  # noqa: E402
+from tap_nhl.tap import Tapnhl  # noqa: E402
+from tap_nhl.tests.mock_api import MockNHLAPI, SyntheticNHLData  # noqa: E402
+
+DATA = SyntheticNHLData(games_per_season=3)
+GAME_IDS = DATA.game_ids("20212022")
+
+
+def _sync(api, tmp_path, capsys, state=None, **config):
+    tap = Tapnhl(
+        config={
+            "start_year": 2021,
+            "end_year": 2022,
+            "api_url": api.stats_url,
+            "shifts_api_url": api.shifts_url,
+            "cache_dir": str(tmp_path),
+            "cache_catalog": False,
+            **config,
+        },
+        state=copy.deepcopy(state),
+        parse_env_config=False,
+    )
+    tap.sync_all()
+    capsys.readouterr()
+    return tap.state
+
+
+def _schedule_state(state):
+    return state["bookmarks"]["schedule"]
+
+
+def _completed_games(state):
+    completed = set()
+    for partition in _schedule_state(state).get("partitions", []):
+        completed |= decode_ranges(partition.get("completed_games"))
+    return completed
+
+
+def _feed_requests(api):
+    return sum(
+        api.requests[f"/api/v1/game/{game_id}/feed/live"] for game_id in GAME_IDS
+    )
+
+
+def test_synced_final_games_are_completed(tmp_path, capsys):
+    """Final games whose children were synced are recorded per season."""
+    with MockNHLAPI(data=DATA) as api:
+        state = _sync(api, tmp_path, capsys)
+    assert _completed_games(state) == set(GAME_IDS)
+    assert not decode_ranges(_schedule_state(state).get("deferred_games"))
+
+
+def test_skip_completed_games(tmp_path, capsys):
+    """Completed games are not synced again with `skip_completed_games`."""
+    with MockNHLAPI(data=DATA) as api:
+        state = _sync(api, tmp_path, capsys)
+        assert _feed_requests(api) == len(GAME_IDS)
+        _sync(api, tmp_path, capsys, state=state, skip_completed_games=True)
+        assert _feed_requests(api) == len(GAME_IDS)
+        _sync(api, tmp_path, capsys, state=state)
+        assert _feed_requests(api) == 2 * len(GAME_IDS)
+
+
+def test_games_are_deferred_once_the_budget_is_spent(tmp_path, capsys):
+    """With no time budget left, games are deferred instead of synced."""
+    with MockNHLAPI(data=DATA) as api:
+        state = _sync(api, tmp_path, capsys, game_time_budget=0)
+        assert _feed_requests(api) == 0
+    assert decode_ranges(_schedule_state(state)["deferred_games"]) == set(GAME_IDS)
+    assert not _completed_games(state)
+
+
+def test_deferred_games_are_synced_first_on_the_next_run(tmp_path, capsys):
+    """Games deferred by an exhausted budget are retried before other games."""
+    with MockNHLAPI(data=DATA) as api:
+        state = _sync(api, tmp_path, capsys, game_time_budget=0)
+    # a game deferred by an earlier run over another season range
+    _schedule_state(state)["deferred_games"] += ",2015020001"
+
+    more_games = SyntheticNHLData(games_per_season=6)
+    with MockNHLAPI(data=more_games) as api:
+        state = _sync(api, tmp_path, capsys, state=state, prioritize_recent_games=True)
+    feeds = [
+        int(path.split("/")[-3]) for path in api.paths if path.endswith("/feed/live")
+    ]
+    assert feeds[0:3] == sorted(GAME_IDS, reverse=True)
+    assert set(feeds) == set(more_games.game_ids("20212022"))
+    assert not decode_ranges(_schedule_state(state).get("deferred_games"))
@@ -0,0 +1,36 @@
+"""Tests for priority ordering and time budgeting of game-level work."""
+
+import datetime
+
+from tap_nhl.scheduling import TimeBudget, game_priority
+
+NOW = datetime.datetime(2022, 2, 10, 12, tzinfo=datetime.timezone.utc)
+RECENT = datetime.timedelta(days=3)
+
+
+def _game(game_id, date, state):
+    return {
+        "gamePk": game_id,
+        "gameDate": f"{date}T00:00:00Z",
+        "status": {"abstractGameState": state},
+    }
+
+
+def test_games_ordered_live_recent_deferred_historical_scheduled():
+    games = [
+        _game(1, "2021-10-12", "Final"),
+        _game(2, "2021-10-14", "Final"),
+        _game(3, "2022-02-12", "Preview"),
+        _game(4, "2022-02-09", "Final"),
+        _game(5, "2021-10-13", "Final"),
+        _game(6, "2022-02-10", "Live"),
+        _game(7, "2022-02-08", "Final"),
+    ]
+    ordered = sorted(games, key=lambda game: game_priority(game, {1}, NOW, RECENT))
+    assert [game["gamePk"] for game in ordered] == [6, 4, 7, 1, 2, 5, 3]
+
+
+def test_time_budget():
+    assert not TimeBudget(None).exhausted
+    assert TimeBudget(0).exhausted
+    assert not TimeBudget(3600).exhausted
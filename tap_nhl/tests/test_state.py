@@ -0,0 +1,18 @@
+"""Tests for the compact state encodings."""
+
+from tap_nhl.state import decode_ranges, encode_ranges
+
+
+def test_encode_ranges():
+    assert encode_ranges([]) == ""
+    assert encode_ranges([5]) == "5"
+    assert encode_ranges([3, 1, 2, 2, 7, 9, 10]) == "1-3,7,9-10"
+
+
+def test_ranges_round_trip_stay_compact():
+    games = set(range(2021020001, 2021021313)) | {2021030111, 2021030112}
+    encoded = encode_ranges(games)
+    assert encoded == "2021020001-2021021312,2021030111-2021030112"
+    assert decode_ranges(encoded) == games
+    assert decode_ranges("") == set()
+    assert decode_ranges(None) == set()
@@ -0,0 +1,246 @@
+"""Tests for the batched per-game transformations."""
+
+import random
+
+from tap_nhl.transforms import (
+    ShiftIndex,
+    annotate_on_ice,
+    normalize_play_coordinates,
+    normalize_shifts,
+    team_game_stats,
+)
+
+
+def test_normalize_shifts_parses_clock_and_player_toi():
+    """Shift clocks become seconds and TOI is aggregated per player."""
+    shifts = normalize_shifts(
+        [
+            {
+                "playerId": 1,
+                "period": 1,
+                "duration": "00:45",
+                "startTime": "00:00",
+                "endTime": "00:45",
+            },
+            {
+                "playerId": 1,
+                "period": 2,
+                "duration": "01:05",
+                "startTime": "10:00",
+                "endTime": "11:05",
+            },
+            {
+                "playerId": 2,
+                "period": 1,
+                "duration": None,
+                "startTime": "05:00",
+                "endTime": "05:00",
+            },
+        ]
+    )
+    assert shifts[1]["durationSeconds"] == 65
+    assert shifts[1]["gameStartSeconds"] == 1800
+    assert shifts[1]["gameEndSeconds"] == 1865
+    assert shifts[0]["playerGameToiSeconds"] == 110
+    assert shifts[0]["playerGameShiftCount"] == 2
+    assert shifts[2]["durationSeconds"] is None
+    assert shifts[2]["playerGameToiSeconds"] is None
+
+
+def test_annotate_on_ice_handles_line_changes():
+    """Plays at a change belong to the outgoing line unless it is a faceoff."""
+    shifts = [
+        {
+            "period": 1,
+            "startTime": "00:00",
+            "endTime": "00:45",
+            "teamId": 1,
+            "playerId": 11,
+        },
+        {
+            "period": 1,
+            "startTime": "00:45",
+            "endTime": "01:30",
+            "teamId": 1,
+            "playerId": 12,
+        },
+        {
+            "period": 1,
+            "startTime": "00:00",
+            "endTime": "20:00",
+            "teamId": 2,
+            "playerId": 21,
+        },
+    ]
+    feed = {
+        "gameData": {"teams": {"home": {"id": 1}, "away": {"id": 2}}},
+        "liveData": {
+            "plays": {
+                "allPlays": [
+                    {
+                        "about": {"period": 1, "periodTime": "00:45", "eventIdx": 0},
+                        "result": {"eventTypeId": "SHOT"},
+                    },
+                    {
+                        "about": {"period": 1, "periodTime": "00:45", "eventIdx": 1},
+                        "result": {"eventTypeId": "FACEOFF"},
+                    },
+                ]
+            }
+        },
+    }
+    shot, faceoff = annotate_on_ice(2021020001, feed, shifts)
+    assert shot["homeOnIce"] == [11]
+    assert faceoff["homeOnIce"] == [12]
+    assert shot["awayOnIce"] == faceoff["awayOnIce"] == [21]
+
+
+def test_shift_index_matches_a_full_scan_with_full_period_shifts():
+    """Lookups agree with a brute-force scan, including goalie-length shifts."""
+    rng = random.Random(7)
+    shifts = [
+        {
+            "period": 1,
+            "startTime": "00:00",
+            "endTime": "20:00",
+            "teamId": team_id,
+            "playerId": 10000 + team_id,
+        }
+        for team_id in [1, 2]
+    ]
+    for number in range(300):
+        start = rng.randrange(0, 1150)
+        end = start + rng.randrange(1, 60)
+        shifts.append(
+            {
+                "period": 1,
+                "startTime": f"{start // 60:02d}:{start % 60:02d}",
+                "endTime": f"{end // 60:02d}:{end % 60:02d}",
+                "teamId": 1 + number % 2,
+                "playerId": number,
+            }
+        )
+    index = ShiftIndex(shifts)
+    rows = [
+        (
+            int(s["startTime"][:2]) * 60 + int(s["startTime"][3:]),
+            int(s["endTime"][:2]) * 60 + int(s["endTime"][3:]),
+            s["teamId"],
+            s["playerId"],
+        )
+        for s in shifts
+    ]
+    for seconds in range(0, 1201, 7):
+        for at_faceoff in [False, True]:
+            expected = {}
+            for start, end, team_id, player_id in sorted(rows):
+                if at_faceoff:
+                    on_ice = start <= seconds < end
+                else:
+                    on_ice = start < seconds <= end
+                if on_ice:
+                    expected.setdefault(team_id, []).append(player_id)
+            expected = {team: sorted(ids) for team, ids in expected.items()}
+            assert index.on_ice(1, seconds, at_faceoff) == expected
+
+
+def _play(event_type, team_id, period, x, y, home_goals, away_goals):
+    return {
+        "result": {"eventTypeId": event_type},
+        "team": {"id": team_id},
+        "about": {"period": period, "goals": {"home": home_goals, "away": away_goals}},
+        "coordinates": {"x": x, "y": y},
+    }
+
+
+def _shootout_attempt(event_type, team_id, x):
+    play = _play(event_type, team_id, 5, x, 0, 2, 2)
+    play["about"]["periodType"] = "SHOOTOUT"
+    return play
+
+
+def test_team_game_stats_counts_attempts_per_team():
+    """Blocked shots count for the shooting team and goals use the prior score."""
+    feed = {
+        "gameData": {"teams": {"home": {"id": 1}, "away": {"id": 2}}},
+        "liveData": {
+            "plays": {
+                "allPlays": [
+                    _play("FACEOFF", 1, 1, 0, 0, 0, 0),
+                    _play("SHOT", 1, 1, 80, 5, 0, 0),
+                    _play("GOAL", 1, 1, 85, 0, 1, 0),
+                    _play("BLOCKED_SHOT", 1, 2, -60, 10, 1, 0),
+                    _play("MISSED_SHOT", 2, 2, -40, 0, 1, 0),
+                ]
+            }
+        },
+    }
+    home, away = team_game_stats(2021020001, feed)
+    assert (home["corsiFor"], home["corsiAgainst"]) == (2, 2)
+    assert (home["fenwickFor"], home["fenwickAgainst"]) == (2, 1)
+    assert home["goalsFor"] == away["goalsAgainst"] == 1
+    assert home["highDangerFor"] == 2
+    assert home["corsiForTied"] == 2
+    assert away["corsiForTrailing"] == 2
+    assert [p["corsiAgainst"] for p in home["periods"]] == [0, 2]
+
+
+def test_team_game_stats_excludes_shootout_attempts():
+    """Shootout attempts count toward no goal, shot, Corsi or Fenwick total."""
+    feed = {
+        "gameData": {"teams": {"home": {"id": 1}, "away": {"id": 2}}},
+        "liveData": {
+            "plays": {
+                "allPlays": [
+                    _play("GOAL", 1, 1, 80, 0, 1, 0),
+                    _play("SHOT", 2, 2, -70, 5, 1, 0),
+                    _play("GOAL", 2, 3, -75, 0, 1, 1),
+                    _play("SHOT", 1, 4, 60, 0, 1, 1),
+                    _shootout_attempt("GOAL", 1, 80),
+                    _shootout_attempt("SHOT", 2, 80),
+                    _shootout_attempt("MISSED_SHOT", 1, 80),
+                ]
+            }
+        },
+    }
+    home, away = team_game_stats(2021030001, feed)
+    assert (home["goalsFor"], home["shotsFor"], home["corsiFor"]) == (1, 2, 2)
+    assert (away["goalsFor"], away["shotsFor"], away["fenwickFor"]) == (1, 2, 2)
+    assert [row["period"] for row in home["periods"]] == [1, 2, 3, 4]
+
+
+def test_shootout_attempts_do_not_decide_attacking_sides():
+    """Shootout attempts, all at one end, leave the inferred sides unchanged."""
+    plays = [
+        _play("SHOT", 1, 1, 80, 5, 0, 0),
+        _play("SHOT", 2, 1, -70, -10, 0, 0),
+        _play("SHOT", 2, 4, 75, 0, 0, 0),
+    ] + [_shootout_attempt("SHOT", 1, -80) for _ in range(5)]
+    normalized = normalize_play_coordinates(plays)
+    assert [play["normalizedCoordinates"]["x"] for play in normalized[0:3]] == [
+        80.0,
+        70.0,
+        75.0,
+    ]
+
+
+def test_normalize_play_coordinates_flips_by_period():
+    """Shots from both periods end up attacking the +x goal."""
+    plays = normalize_play_coordinates(
+        [
+            _play("SHOT", 1, 1, 80, 5, 0, 0),
+            _play("SHOT", 2, 1, -70, -10, 0, 0),
+            _play("SHOT", 1, 2, -85, 3, 0, 0),
+            _play("HIT", 2, 2, 50, 20, 0, 0),
+        ]
+    )
+    assert plays[0]["normalizedCoordinates"]["distance"] == 10.3
+    assert plays[1]["normalizedCoordinates"]["x"] == 70.0
+    assert plays[2]["normalizedCoordinates"] == {
+        "x": 85.0,
+        "y": -3.0,
+        "distance": 5.0,
+        "angle": 36.9,
+    }
+    assert plays[3]["normalizedCoordinates"]["x"] == 50.0
+    assert plays[3]["normalizedCoordinates"]["distance"] is None
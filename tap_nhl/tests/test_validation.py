@@ -0,0 +1,102 @@
+"""Tests for the compiled record validators."""
+
+import json
+
+import pytest
+
+from tap_nhl.validation import (
+    RecordValidationError,
+    SampledValidator,
+    compile_validator,
+)
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": ["integer", "null"]},
+        "name": {"type": ["string", "null"]},
+        "players": {
+            "type": ["array", "null"],
+            "items": {
+                "type": ["object", "null"],
+                "properties": {"id": {"type": ["integer", "null"]}},
+            },
+        },
+    },
+}
+
+
+def test_compiled_validator_coerces_values(tmp_path):
+    """Compiled validators coerce compatible values in place."""
+    validate = compile_validator(SCHEMA, tmp_path)
+    record = validate({"id": "8478402", "name": 97, "players": [{"id": "1"}]})
+    assert record == {"id": 8478402, "name": "97", "players": [{"id": 1}]}
+
+
+def test_compiled_validator_reuses_disk_cache(tmp_path):
+    """A second compilation loads the cached code object."""
+    compile_validator(SCHEMA, tmp_path)
+    assert len(list((tmp_path / "validators").iterdir())) == 1
+    validate = compile_validator(SCHEMA, tmp_path)
+    assert validate({"id": 1}) == {"id": 1}
+
+
+def test_compiled_validator_rejects_bad_values():
+    """Values that cannot be coerced raise with their JSON path."""
+    validate = compile_validator(SCHEMA)
+    with pytest.raises(RecordValidationError, match=r"\$\.players\[\]\.id"):
+        validate({"players": [{"id": "McDavid"}]})
+
+
+def test_sampled_validator_skips_unsampled_records():
+    """A zero sample rate never calls the compiled validator."""
+    validate = SampledValidator(compile_validator(SCHEMA), sample_rate=0)
+    assert validate({"id": "not-an-int"}) == {"id": "not-an-int"}
+
+
+def _records(output):
+    records = []
+    for line in output.splitlines():
+        if line.startswith("{"):
+            message = json.loads(line)
+            if message["type"] == "RECORD":
+                records.append((message["stream"], message["record"]))
+    return records
+
+
+def test_validated_records_are_not_conformed_again(tmp_path, capsys, monkeypatch):
+    """The SDK only conforms the records the compiled validator did not cover."""
+    pytest.importorskip("singer_sdk")
+    from tap_nhl import client
+    from tap_nhl.tap import Tapnhl
+    from tap_nhl.tests.mock_api import MockNHLAPI, SyntheticNHLData
+
+    conformed = []
+    conform = client.conform_record_data_types
+
+    def counting_conform(**kwargs):
+        conformed.append(kwargs["stream_name"])
+        return conform(**kwargs)
+
+    monkeypatch.setattr(client, "conform_record_data_types", counting_conform)
+    runs = {}
+    with MockNHLAPI(data=SyntheticNHLData(games_per_season=1)) as api:
+        for validate in [False, True]:
+            conformed.clear()
+            Tapnhl(
+                config={
+                    "start_year": 2021,
+                    "end_year": 2022,
+                    "api_url": api.stats_url,
+                    "shifts_api_url": api.shifts_url,
+                    "cache_dir": str(tmp_path / str(validate)),
+                    "cache_catalog": False,
+                    "validate_records": validate,
+                },
+                parse_env_config=False,
+            ).sync_all()
+            runs[validate] = (_records(capsys.readouterr().out), list(conformed))
+    (plain, plain_conformed), (validated, validated_conformed) = runs.values()
+    assert validated == plain
+    assert "live_plays" in plain_conformed
+    assert "live_plays" not in validated_conformed
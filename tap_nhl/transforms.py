@@ -0,0 +1,433 @@
+"""Batched, per-game transformations applied to raw NHL API records."""
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PERIOD_SECONDS = 20 * 60
+
+
+def clock_to_seconds(values: pd.Series) -> np.ndarray:
+    """Vectorized "MM:SS" to seconds conversion; unparseable values become NaN."""
+    parts = values.astype("string").str.extract(r"^\s*(\d+):(\d{1,2})\s*$")
+    minutes = pd.to_numeric(parts[0], errors="coerce").to_numpy(dtype=float)
+    seconds = pd.to_numeric(parts[1], errors="coerce").to_numpy(dtype=float)
+    return minutes * 60 + seconds
+
+
+def clock_seconds(value: Optional[str]) -> Optional[int]:
+    """Convert a single "MM:SS" clock value to seconds."""
+    try:
+        minutes, seconds = str(value).split(":")
+        return int(minutes) * 60 + int(seconds)
+    except (TypeError, ValueError):
+        return None
+
+
+def _optional_ints(values: np.ndarray) -> List[Optional[int]]:
+    return [None if value != value else int(value) for value in values.tolist()]
+
+
+def normalize_shifts(shifts: List[dict]) -> List[dict]:
+    """Add parsed clock fields and per-player TOI aggregates to a game's shifts.
+
+    The whole `/shiftcharts` array of one game is processed as a single frame,
+    so time parsing and the per-player aggregation run as vectorized operations.
+    """
+    if not shifts:
+        return shifts
+    frame = pd.DataFrame(
+        {
+            "playerId": [shift.get("playerId") for shift in shifts],
+            "period": [shift.get("period") for shift in shifts],
+            "duration": [shift.get("duration") for shift in shifts],
+            "startTime": [shift.get("startTime") for shift in shifts],
+            "endTime": [shift.get("endTime") for shift in shifts],
+        }
+    )
+    duration = clock_to_seconds(frame["duration"])
+    start = clock_to_seconds(frame["startTime"])
+    end = clock_to_seconds(frame["endTime"])
+    period_offset = (
+        pd.to_numeric(frame["period"], errors="coerce").to_numpy(dtype=float) - 1
+    ) * PERIOD_SECONDS
+
+    frame["durationSeconds"] = duration
+    by_player = frame.groupby("playerId", dropna=False)["durationSeconds"]
+    player_shifts = by_player.transform("count").to_numpy(dtype=float)
+    # players without any timed shift (e.g. goal event rows only) have no TOI
+    player_toi = np.where(
+        player_shifts > 0, by_player.transform("sum").to_numpy(dtype=float), np.nan
+    )
+
+    columns = {
+        "durationSeconds": _optional_ints(duration),
+        "startTimeSeconds": _optional_ints(start),
+        "endTimeSeconds": _optional_ints(end),
+        "gameStartSeconds": _optional_ints(period_offset + start),
+        "gameEndSeconds": _optional_ints(period_offset + end),
+        "playerGameToiSeconds": _optional_ints(player_toi),
+        "playerGameShiftCount": _optional_ints(player_shifts),
+    }
+    for index, shift in enumerate(shifts):
+        for name, values in columns.items():
+            shift[name] = values[index]
+    return shifts
+
+
+class ShiftIndex:
+    """Per-period on-ice sets precomputed by a sweep over shift boundaries.
+
+    The distinct start and end times of a period's shifts split it into
+    segments during which nobody changes. One sweep over the sorted start/end
+    events records who is on ice in each segment, so building costs
+    O(n log n + n * k) for n shifts and k skaters on ice, and a lookup is a
+    single bisect however long the longest shift (e.g. a goalie's) is.
+    """
+
+    def __init__(self, shifts: Iterable[dict]) -> None:
+        """Build the per-period on-ice segments of a game's shifts."""
+        intervals: Dict[int, List[Tuple[int, int, int, int]]] = {}
+        for shift in shifts:
+            start = clock_seconds(shift.get("startTime"))
+            end = clock_seconds(shift.get("endTime"))
+            # goal rows in the shift chart are zero-length and carry no TOI
+            if start is None or end is None or end <= start:
+                continue
+            if shift.get("period") is None or shift.get("playerId") is None:
+                continue
+            intervals.setdefault(int(shift["period"]), []).append(
+                (start, end, shift["teamId"], shift["playerId"])
+            )
+        self._boundaries: Dict[int, List[int]] = {}
+        self._segments: Dict[int, List[Dict[int, List[int]]]] = {}
+        for period, rows in intervals.items():
+            self._sweep(period, rows)
+
+    def _sweep(self, period: int, rows: List[Tuple[int, int, int, int]]) -> None:
+        starting: Dict[int, List[Tuple[int, int]]] = {}
+        ending: Dict[int, List[Tuple[int, int]]] = {}
+        for start, end, team_id, player_id in rows:
+            starting.setdefault(start, []).append((team_id, player_id))
+            ending.setdefault(end, []).append((team_id, player_id))
+        boundaries = sorted(set(starting) | set(ending))
+        active: Dict[Tuple[int, int], int] = {}
+        segments = []
+        # segment i runs from boundaries[i] to boundaries[i + 1]
+        for boundary in boundaries[:-1]:
+            for key in ending.get(boundary, []):
+                active[key] -= 1
+                if not active[key]:
+                    del active[key]
+            for key in starting.get(boundary, []):
+                active[key] = active.get(key, 0) + 1
+            players: Dict[int, List[int]] = {}
+            for team_id, player_id in sorted(active):
+                players.setdefault(team_id, []).append(player_id)
+            segments.append(players)
+        self._boundaries[period] = boundaries
+        self._segments[period] = segments
+
+    def on_ice(
+        self, period: int, seconds: int, at_faceoff: bool = False
+    ) -> Dict[int, List[int]]:
+        """Return the player IDs on ice per team at `seconds` into `period`.
+
+        Players changing at the exact second count for the shift that ends
+        there, except at faceoffs, where the incoming players are on ice.
+        """
+        boundaries = self._boundaries.get(period)
+        if not boundaries:
+            return {}
+        if at_faceoff:
+            # the segment starting at or containing `seconds`
+            index = bisect_right(boundaries, seconds) - 1
+        else:
+            # the segment ending at or containing `seconds`
+            index = bisect_left(boundaries, seconds) - 1
+        segments = self._segments[period]
+        if index < 0 or index >= len(segments):
+            return {}
+        return {
+            team_id: list(player_ids) for team_id, player_ids in segments[index].items()
+        }
+
+
+def annotate_on_ice(game_id: int, feed: dict, shifts: Iterable[dict]) -> Iterable[dict]:
+    """Yield one row per play of a live feed with the skaters on ice."""
+    teams = feed.get("gameData", {}).get("teams", {})
+    home_id = teams.get("home", {}).get("id")
+    away_id = teams.get("away", {}).get("id")
+    index = ShiftIndex(shifts)
+    for play in feed_plays(feed):
+        about = play.get("about", {})
+        event_type = play.get("result", {}).get("eventTypeId")
+        period = about.get("period")
+        seconds = clock_seconds(about.get("periodTime"))
+        on_ice: Dict[int, List[int]] = {}
+        if period is not None and seconds is not None:
+            on_ice = index.on_ice(period, seconds, at_faceoff=event_type == "FACEOFF")
+        yield {
+            "gameId": game_id,
+            "eventIdx": about.get("eventIdx"),
+            "eventId": about.get("eventId"),
+            "eventTypeId": event_type,
+            "period": period,
+            "periodTime": about.get("periodTime"),
+            "periodSeconds": seconds,
+            "teamId": play.get("team", {}).get("id"),
+            "homeTeamId": home_id,
+            "awayTeamId": away_id,
+            "homeOnIce": on_ice.get(home_id, []),
+            "awayOnIce": on_ice.get(away_id, []),
+        }
+
+
+SHOT, GOAL, MISSED_SHOT, BLOCKED_SHOT = 1, 2, 3, 4
+SHOT_EVENT_CODES = {
+    "SHOT": SHOT,
+    "GOAL": GOAL,
+    "MISSED_SHOT": MISSED_SHOT,
+    "BLOCKED_SHOT": BLOCKED_SHOT,
+}
+GOAL_LINE_X = 89.0
+HIGH_DANGER_DISTANCE = 20.0  # feet from the centre of the attacked goal line
+
+
+def _optional_float(value: Optional[float]) -> float:
+    return np.nan if value is None else float(value)
+
+
+def feed_plays(feed: dict) -> List[dict]:
+    """Return the allPlays array of a live feed."""
+    return feed.get("liveData", {}).get("plays", {}).get("allPlays", [])
+
+
+def play_arrays(plays: List[dict]) -> Dict[str, np.ndarray]:
+    """Return the columns of a game's plays as NumPy arrays."""
+    abouts = [play.get("about") or {} for play in plays]
+    coordinates = [play.get("coordinates") or {} for play in plays]
+    goals = [about.get("goals") or {} for about in abouts]
+    return {
+        "event": np.array(
+            [
+                SHOT_EVENT_CODES.get(
+                    (play.get("result") or {}).get("eventTypeId", ""), 0
+                )
+                for play in plays
+            ],
+            dtype=np.int8,
+        ),
+        "team": np.array(
+            [(play.get("team") or {}).get("id") or 0 for play in plays],
+            dtype=np.int64,
+        ),
+        "period": np.array(
+            [about.get("period") or 0 for about in abouts], dtype=np.int64
+        ),
+        "x": np.array(
+            [_optional_float(coords.get("x")) for coords in coordinates], dtype=float
+        ),
+        "y": np.array(
+            [_optional_float(coords.get("y")) for coords in coordinates], dtype=float
+        ),
+        "home_goals": np.array(
+            [goal.get("home") or 0 for goal in goals], dtype=np.int64
+        ),
+        "away_goals": np.array(
+            [goal.get("away") or 0 for goal in goals], dtype=np.int64
+        ),
+        "shootout": np.array(
+            [about.get("periodType") == "SHOOTOUT" for about in abouts], dtype=bool
+        ),
+    }
+
+
+def game_shot_events(arrays: Dict[str, np.ndarray]) -> np.ndarray:
+    """Return the shot event codes of `play_arrays`, with shootout attempts as 0.
+
+    Shootout attempts are not part of the game's shot, Corsi or Fenwick counts.
+    """
+    return np.where(arrays["shootout"], 0, arrays["event"])
+
+
+def team_game_stats(game_id: int, feed: dict) -> List[dict]:
+    """Return one row of shot-based team stats per team for a live feed.
+
+    Corsi counts all shot attempts, Fenwick unblocked attempts, and high-danger
+    chances are unblocked attempts within HIGH_DANGER_DISTANCE of the net.
+    Score-state splits use the score before each attempt, from the shooting
+    team's point of view. Shootout attempts are not counted. All counts are
+    computed with vectorized masks over the game's play arrays.
+    """
+    teams = feed.get("gameData", {}).get("teams", {})
+    home, away = teams.get("home") or {}, teams.get("away") or {}
+    plays = play_arrays(feed_plays(feed))
+    event = game_shot_events(plays)
+    if not home.get("id") or not away.get("id"):
+        return []
+
+    attempt = event > 0
+    unblocked = attempt & (event != BLOCKED_SHOT)
+    on_goal = (event == SHOT) | (event == GOAL)
+    is_goal = event == GOAL
+    # blocked shots are credited to the blocking team
+    credited_home = plays["team"] == home["id"]
+    shooter_home = np.where(event == BLOCKED_SHOT, ~credited_home, credited_home)
+    distance = np.hypot(GOAL_LINE_X - np.abs(plays["x"]), plays["y"])
+    high_danger = unblocked & (distance <= HIGH_DANGER_DISTANCE)
+
+    # about.goals holds the score after the event, so undo the goal itself
+    home_before = plays["home_goals"] - (is_goal & shooter_home)
+    away_before = plays["away_goals"] - (is_goal & ~shooter_home)
+    home_lead = np.sign(home_before - away_before)
+    shooter_lead = np.where(shooter_home, home_lead, -home_lead)
+
+    period = plays["period"]
+    periods = np.unique(period[attempt & (period > 0)])
+
+    def count(mask: np.ndarray) -> int:
+        return int(np.count_nonzero(mask))
+
+    rows = []
+    for team, opponent, is_home in [(home, away, True), (away, home, False)]:
+        team_for = shooter_home == is_home
+        team_against = ~team_for
+        period_rows = []
+        for number in periods.tolist():
+            in_period = period == number
+            period_rows.append(
+                {
+                    "period": number,
+                    "goalsFor": count(is_goal & team_for & in_period),
+                    "shotsFor": count(on_goal & team_for & in_period),
+                    "corsiFor": count(attempt & team_for & in_period),
+                    "corsiAgainst": count(attempt & team_against & in_period),
+                    "fenwickFor": count(unblocked & team_for & in_period),
+                    "fenwickAgainst": count(unblocked & team_against & in_period),
+                }
+            )
+        rows.append(
+            {
+                "gameId": game_id,
+                "teamId": team.get("id"),
+                "teamTriCode": team.get("triCode"),
+                "opponentTeamId": opponent.get("id"),
+                "isHome": is_home,
+                "goalsFor": count(is_goal & team_for),
+                "goalsAgainst": count(is_goal & team_against),
+                "shotsFor": count(on_goal & team_for),
+                "shotsAgainst": count(on_goal & team_against),
+                "corsiFor": count(attempt & team_for),
+                "corsiAgainst": count(attempt & team_against),
+                "fenwickFor": count(unblocked & team_for),
+                "fenwickAgainst": count(unblocked & team_against),
+                "highDangerFor": count(high_danger & team_for),
+                "highDangerAgainst": count(high_danger & team_against),
+                "corsiForLeading": count(attempt & team_for & (shooter_lead > 0)),
+                "corsiForTied": count(attempt & team_for & (shooter_lead == 0)),
+                "corsiForTrailing": count(attempt & team_for & (shooter_lead < 0)),
+                "corsiAgainstLeading": count(
+                    attempt & team_against & (shooter_lead < 0)
+                ),
+                "corsiAgainstTied": count(attempt & team_against & (shooter_lead == 0)),
+                "corsiAgainstTrailing": count(
+                    attempt & team_against & (shooter_lead > 0)
+                ),
+                "periods": period_rows,
+            }
+        )
+    return rows
+
+
+def attacking_signs(plays: List[dict]) -> Dict[Tuple[int, int], float]:
+    """Infer the attacking direction (+1 towards +x, -1 towards -x) per team/period.
+
+    Teams switch ends every period, so all unblocked attempts of a team are
+    folded onto period 1 by flipping even periods, and the sign of the mean x
+    gives its period 1 direction. A team without attempts attacks opposite its
+    opponent.
+    """
+    arrays = play_arrays(plays)
+    # shootout attempts are all taken at one end, whoever shoots
+    event, team, period, x = (
+        game_shot_events(arrays),
+        arrays["team"],
+        arrays["period"],
+        arrays["x"],
+    )
+    parity = np.where(period % 2 == 1, 1.0, -1.0)
+    shots = (event > 0) & (event != BLOCKED_SHOT) & ~np.isnan(x) & (period > 0)
+    teams = np.unique(team[team > 0])
+    first_period_sign = {}
+    for team_id in teams.tolist():
+        team_shots = shots & (team == team_id)
+        folded_x = np.sum(x[team_shots] * parity[team_shots])
+        first_period_sign[team_id] = float(np.sign(folded_x))
+    if len(first_period_sign) == 2:
+        (a, sign_a), (b, sign_b) = first_period_sign.items()
+        if sign_a == 0 or sign_a == sign_b:
+            # keep the estimate backed by more evidence, the other is opposite
+            a_count = np.count_nonzero(shots & (team == a))
+            b_count = np.count_nonzero(shots & (team == b))
+            if a_count >= b_count:
+                first_period_sign[b] = -sign_a
+            else:
+                first_period_sign[a] = -sign_b
+    signs = {}
+    for team_id, sign in first_period_sign.items():
+        if sign == 0:
+            continue
+        for number in np.unique(period[period > 0]).tolist():
+            signs[(team_id, number)] = sign if number % 2 == 1 else -sign
+    return signs
+
+
+def normalize_play_coordinates(
+    plays: List[dict], reference_plays: Optional[List[dict]] = None
+) -> List[dict]:
+    """Add rink coordinates normalized to the attacking team's direction.
+
+    Normalized coordinates always point the attack towards the goal at
+    (GOAL_LINE_X, 0). Blocked shots are oriented for the shooting team, which
+    is the opponent of the credited (blocking) team. Shot attempts also get
+    their distance (feet) and angle (degrees) to that goal. Attacking sides
+    are inferred from `reference_plays` (defaults to `plays`), so a filtered
+    subset can be normalized against the whole game.
+    """
+    if not plays:
+        return plays
+    signs = attacking_signs(reference_plays if reference_plays is not None else plays)
+    arrays = play_arrays(plays)
+    event, team, period = arrays["event"], arrays["team"], arrays["period"]
+    sign = np.array(
+        [
+            signs.get((team_id, number), np.nan)
+            for team_id, number in zip(team.tolist(), period.tolist())
+        ],
+        dtype=float,
+    )
+    # blocked shots are credited to the blocker but oriented for the shooter
+    sign = np.where(event == BLOCKED_SHOT, -sign, sign)
+    x = arrays["x"] * sign
+    y = arrays["y"] * sign
+    attempt = event > 0
+    distance = np.where(attempt, np.hypot(GOAL_LINE_X - x, y), np.nan)
+    angle = np.where(
+        attempt, np.degrees(np.arctan2(np.abs(y), GOAL_LINE_X - x)), np.nan
+    )
+    x, y = np.round(x, 1).tolist(), np.round(y, 1).tolist()
+    distance, angle = np.round(distance, 1).tolist(), np.round(angle, 1).tolist()
+    for index, play in enumerate(plays):
+        if x[index] != x[index]:
+            play["normalizedCoordinates"] = None
+            continue
+        play["normalizedCoordinates"] = {
+            "x": x[index],
+            "y": y[index],
+            "distance": None if distance[index] != distance[index] else distance[index],
+            "angle": None if angle[index] != angle[index] else angle[index],
+        }
+    return plays
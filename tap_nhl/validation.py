@@ -0,0 +1,231 @@
+"""Compiled JSON schema validators and coercers for tap-nhl streams.
+
+Each stream schema is turned into Python source specialised for that schema
+(one branch per property, no generic schema walking at runtime), compiled once
+and cached on disk as a marshalled code object keyed by the schema digest.
+"""
+
+import hashlib
+import json
+import marshal
+import random
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+CODEGEN_VERSION = "1"
+VALIDATOR_FUNC_NAME = "validate_record"
+
+
+class RecordValidationError(ValueError):
+    """Raised when a record does not match its stream schema."""
+
+
+def _fail(path: str, expected: str, value: Any) -> None:
+    raise RecordValidationError(
+        f"{path}: expected {expected}, got {type(value).__name__} {value!r}"
+    )
+
+
+def _coerce_integer(value: Any, path: str) -> int:
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    _fail(path, "integer", value)
+    return 0  # unreachable, keeps type checkers happy
+
+
+def _coerce_number(value: Any, path: str) -> float:
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    _fail(path, "number", value)
+    return 0.0
+
+
+def _coerce_string(value: Any, path: str) -> str:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    _fail(path, "string", value)
+    return ""
+
+
+def _coerce_boolean(value: Any, path: str) -> bool:
+    if value in ("true", "True", 1):
+        return True
+    if value in ("false", "False", 0):
+        return False
+    _fail(path, "boolean", value)
+    return False
+
+
+RUNTIME_HELPERS = {
+    "_fail": _fail,
+    "_coerce_integer": _coerce_integer,
+    "_coerce_number": _coerce_number,
+    "_coerce_string": _coerce_string,
+    "_coerce_boolean": _coerce_boolean,
+}
+
+
+def schema_digest(schema: dict) -> str:
+    """Return a stable digest for a schema and the code generator version."""
+    payload = json.dumps(schema, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(CODEGEN_VERSION.encode("utf-8") + payload).hexdigest()
+
+
+def _schema_types(schema: dict) -> List[str]:
+    types = schema.get("type", [])
+    types = [types] if isinstance(types, str) else list(types)
+    if not types and "anyOf" in schema:
+        for sub_schema in schema["anyOf"]:
+            types.extend(t for t in _schema_types(sub_schema) if t not in types)
+    return types
+
+
+class _CodeGenerator:
+    """Emit the Python source of a validator for one JSON schema."""
+
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self._counter = 0
+
+    def _var(self) -> str:
+        self._counter += 1
+        return f"v{self._counter}"
+
+    def emit(self, indent: int, line: str) -> None:
+        self.lines.append("    " * indent + line)
+
+    def value(self, schema: dict, var: str, path: str, indent: int) -> None:
+        """Emit checks for `var`; coerced values are rebound to `var`."""
+        types = _schema_types(schema)
+        non_null = [t for t in types if t != "null"]
+        if not non_null:
+            return
+        if "null" not in types:
+            self.emit(indent, f"if {var} is None:")
+            self.emit(indent + 1, f"_fail({path!r}, {'/'.join(types)!r}, {var})")
+        self.emit(indent, f"if {var} is not None:")
+        indent += 1
+        if "object" in non_null:
+            self.emit(indent, f"if type({var}) is not dict:")
+            self.emit(indent + 1, f"_fail({path!r}, 'object', {var})")
+            self.properties(schema.get("properties", {}), var, path, indent)
+        elif "array" in non_null:
+            self.array(schema.get("items", {}), var, path, indent)
+        elif "integer" in non_null and "number" in non_null:
+            self.emit(indent, f"if type({var}) not in (int, float):")
+            self.emit(indent + 1, f"{var} = _coerce_number({var}, {path!r})")
+        elif "integer" in non_null:
+            self.emit(indent, f"if type({var}) is not int:")
+            self.emit(indent + 1, f"{var} = _coerce_integer({var}, {path!r})")
+        elif "number" in non_null:
+            self.emit(indent, f"if type({var}) is int:")
+            self.emit(indent + 1, f"{var} = float({var})")
+            self.emit(indent, f"elif type({var}) is not float:")
+            self.emit(indent + 1, f"{var} = _coerce_number({var}, {path!r})")
+        elif "string" in non_null:
+            self.emit(indent, f"if type({var}) is not str:")
+            self.emit(indent + 1, f"{var} = _coerce_string({var}, {path!r})")
+        elif "boolean" in non_null:
+            self.emit(indent, f"if type({var}) is not bool:")
+            self.emit(indent + 1, f"{var} = _coerce_boolean({var}, {path!r})")
+
+    def array(self, item_schema: dict, var: str, path: str, indent: int) -> None:
+        """Emit checks for the list bound to `var` and each of its items."""
+        self.emit(indent, f"if type({var}) is not list:")
+        self.emit(indent + 1, f"_fail({path!r}, 'array', {var})")
+        if [t for t in _schema_types(item_schema) if t != "null"]:
+            index, item = self._var(), self._var()
+            self.emit(indent, f"for {index}, {item} in enumerate({var}):")
+            self.value(item_schema, item, f"{path}[]", indent + 1)
+            self.emit(indent + 1, f"{var}[{index}] = {item}")
+
+    def properties(
+        self, properties: Dict[str, dict], var: str, path: str, indent: int
+    ) -> None:
+        """Emit checks for every declared property of the dict bound to `var`."""
+        for name, prop_schema in properties.items():
+            if not _schema_types(prop_schema):
+                continue
+            child = self._var()
+            self.emit(indent, f"{child} = {var}.get({name!r})")
+            self.value(prop_schema, child, f"{path}.{name}", indent)
+            self.emit(indent, f"if {child} is not None:")
+            self.emit(indent + 1, f"{var}[{name!r}] = {child}")
+
+
+def generate_validator_source(schema: dict) -> str:
+    """Return the source of a function validating and coercing one record."""
+    generator = _CodeGenerator()
+    generator.emit(0, f"def {VALIDATOR_FUNC_NAME}(record):")
+    generator.properties(schema.get("properties", {}), "record", "$", 1)
+    generator.emit(1, "return record")
+    return "\n".join(generator.lines) + "\n"
+
+
+def compile_validator(
+    schema: dict, cache_dir: Optional[Path] = None
+) -> Callable[[dict], dict]:
+    """Compile `schema` into a validator, reusing the on-disk cache if present."""
+    digest = schema_digest(schema)
+    cache_file = None
+    code = None
+    if cache_dir is not None:
+        cache_file = (
+            Path(cache_dir)
+            / "validators"
+            / f"{digest}.{sys.implementation.cache_tag}.bin"
+        )
+        if cache_file.exists():
+            try:
+                code = marshal.loads(cache_file.read_bytes())
+            except (EOFError, ValueError, TypeError):
+                code = None
+    if code is None:
+        source = generate_validator_source(schema)
+        code = compile(source, f"<validator {digest[:12]}>", "exec")
+        if cache_file is not None:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(".tmp")
+            tmp_file.write_bytes(marshal.dumps(code))
+            tmp_file.replace(cache_file)
+    namespace: Dict[str, Any] = dict(RUNTIME_HELPERS)
+    exec(code, namespace)
+    return namespace[VALIDATOR_FUNC_NAME]
+
+
+class SampledValidator:
+    """Apply a compiled validator to every record or to a random sample."""
+
+    def __init__(
+        self,
+        validator: Callable[[dict], dict],
+        sample_rate: float = 1.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Run the compiled `validator` on a `sample_rate` fraction of records.
+
+        `seed` makes the sampling reproducible.
+        """
+        self.validator = validator
+        self.sample_rate = sample_rate
+        self._random = random.Random(seed)
+
+    @property
+    def validates_every_record(self) -> bool:
+        """Return True if no record is skipped by the sampling."""
+        return self.sample_rate >= 1
+
+    def __call__(self, record: dict) -> dict:
+        """Validate and coerce `record` if it is sampled, else return it as is."""
+        if self.validates_every_record or self._random.random() < self.sample_rate:
+            return self.validator(record)
+        return record